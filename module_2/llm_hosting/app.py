@@ -3,16 +3,29 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import multiprocessing
 import os
 import re
+import sqlite3
 import sys
+import bisect
 import difflib
-from typing import Any, Dict, List, Tuple
+import functools
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+from flask import Flask, Response, jsonify, request, stream_with_context
+from llama_cpp import Llama, LlamaGrammar  # CPU-only by default if N_GPU_LAYERS=0
+
+try:  # optional: faster JSON for CLI input/output
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
@@ -30,8 +43,63 @@ N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
 
-CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
-CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
+# Offline resolution: MODEL_PATH points at a local GGUF (no hub call at all);
+# MODEL_OFFLINE=1 uses models/<MODEL_FILE> or the HF cache, never the network.
+MODEL_PATH = os.getenv("MODEL_PATH", "")
+MODEL_OFFLINE = os.getenv("MODEL_OFFLINE", "0") == "1"
+USE_MMAP = os.getenv("USE_MMAP", "1") != "0"
+USE_MLOCK = os.getenv("USE_MLOCK", "0") == "1"
+# --serve loads the model in the background at startup; 0 → load on first use.
+PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "1") != "0"
+
+# Resolved next to this file so the lists load from any working directory
+# (e.g. when the update pipeline imports this module in-process).
+_HERE = os.path.dirname(os.path.abspath(__file__))
+CANON_UNIS_PATH = os.getenv(
+    "CANON_UNIS_PATH", os.path.join(_HERE, "canon_universities.txt")
+)
+CANON_PROGS_PATH = os.getenv(
+    "CANON_PROGS_PATH", os.path.join(_HERE, "canon_programs.txt")
+)
+
+# Persistent memo of model answers; set LLM_CACHE_PATH="" to disable.
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(_HERE, "llm_cache.sqlite3"))
+CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "200000"))
+
+# Let llama.cpp reuse the evaluated system prompt + few-shots across rows;
+# PREFIX_CACHE=0 re-evaluates the whole prompt every row.
+PREFIX_CACHE = os.getenv("PREFIX_CACHE", "1") != "0"
+
+# CLI output buffering: rows are written in blocks once either threshold is hit.
+OUTPUT_FLUSH_BYTES = int(os.getenv("OUTPUT_FLUSH_BYTES", str(64 * 1024)))
+OUTPUT_FLUSH_SECONDS = float(os.getenv("OUTPUT_FLUSH_SECONDS", "2.0"))
+# Durable <out>.ckpt progress marker after each flush; CHECKPOINT=0 disables.
+CHECKPOINT = os.getenv("CHECKPOINT", "1") != "0"
+
+# Rows per micro-batch on the streaming NDJSON endpoint.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "32"))
+
+# CLI worker pool: K processes, each with its own model and fewer threads.
+WORKERS = int(os.getenv("LLM_WORKERS", "1"))
+WORKER_THREADS = int(os.getenv("LLM_WORKER_THREADS", "0"))  # 0 → cores / workers
+
+# Answer exact canonical matches without the model; RULES_FIRST=0 disables.
+RULES_FIRST = os.getenv("RULES_FIRST", "1") != "0"
+
+# Constrain decoding to the two-key JSON object; USE_GRAMMAR=0 → free text.
+USE_GRAMMAR = os.getenv("USE_GRAMMAR", "1") != "0"
+
+# GBNF: exactly {"standardized_program": "...", "standardized_university": "..."}
+# Generation ends at the closing brace, so there is no trailing chatter.
+JSON_GRAMMAR = r"""
+root   ::= (
+  "{" ws "\"standardized_program\"" ws ":" ws string ws "," ws
+  "\"standardized_university\"" ws ":" ws string ws "}"
+)
+string ::= "\"" char* "\""
+char   ::= [^"\\\x7F\x00-\x1F] | "\\" ["\\/bfnrt]
+ws     ::= " "?
+"""
 
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
@@ -67,6 +135,45 @@ COMMON_PROG_FIXES: Dict[str, str] = {
     "Info Studies": "Information Studies",
 }
 
+
+def _fold_map(names: List[str]) -> Dict[str, str]:
+    """Map case-folded names to their canonical spelling (first one wins)."""
+    folded: Dict[str, str] = {}
+    for name in names:
+        folded.setdefault(name.casefold(), name)
+    return folded
+
+
+def _compile_abbrevs(table: Dict[str, str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """Fold the abbreviation table into one alternation + group→expansion map.
+
+    Anchors are dropped (callers use ``fullmatch``) and a leading ``(?i)`` is
+    scoped to its own alternative, so each entry keeps its original semantics.
+    """
+    parts: List[str] = []
+    expansions: Dict[str, str] = {}
+    for i, (pat, full) in enumerate(table.items()):
+        ignore_case = pat.startswith("(?i)")
+        body = pat.removeprefix("(?i)").removeprefix("^").removesuffix("$")
+        if ignore_case:
+            body = f"(?i:{body})"
+        group = f"abbrev{i}"
+        parts.append(f"(?P<{group}>{body})")
+        expansions[group] = full
+    return re.compile("|".join(parts)), expansions
+
+
+# Set/dict views of the canonical data for O(1) membership in the hot path.
+CANON_UNI_SET = frozenset(CANON_UNIS)
+CANON_PROG_SET = frozenset(CANON_PROGS)
+CANON_UNI_FOLDED = _fold_map(CANON_UNIS)
+CANON_PROG_FOLDED = _fold_map(CANON_PROGS)
+ABBREV_RE, ABBREV_GROUPS = _compile_abbrevs(ABBREV_UNI)
+
+WHITESPACE_RE = re.compile(r"\s+")
+SPLIT_RE = re.compile(r",| at | @ ")
+TITLE_OF_RE = re.compile(r"\bOf\b")
+
 # ---------------- Few-shot prompt ----------------
 SYSTEM_PROMPT = (
     "You are a data cleaning assistant. Standardize degree program and university "
@@ -110,37 +217,301 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+
+def _model_fingerprint() -> List[Any]:
+    """Identify the GGUF in use by resolved path, size and mtime.
+
+    Uses the loaded model's path when there is one, otherwise where
+    ``_resolve_model_path`` would find it, without touching the hub.
+    """
+    path = (
+        _MODEL_INFO.get("model_path")
+        or MODEL_PATH
+        or os.path.join("models", MODEL_FILE)
+    )
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [os.path.abspath(path), None, None]
+    return [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+
+
+def _prompt_version() -> str:
+    """Cached answers are only valid for the model + prompt + decoding used."""
+    grammar = JSON_GRAMMAR if USE_GRAMMAR else ""
+    return hashlib.sha256(
+        json.dumps(
+            [
+                MODEL_REPO, MODEL_FILE, _model_fingerprint(),
+                SYSTEM_PROMPT, FEW_SHOTS, grammar,
+            ],
+            ensure_ascii=False,
+        ).encode("utf-8")
+    ).hexdigest()[:16]
+
+
 _LLM: Llama | None = None
+_LLM_LOCK = threading.Lock()
+_LOAD_LOCK = threading.Lock()
+# Load status reported by /ready.
+_MODEL_INFO: Dict[str, Any] = {"loading": False, "warm": False, "error": None}
+_GRAMMAR: LlamaGrammar | None = None
 
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
+def _resolve_model_path() -> str:
+    """Find the GGUF file, only touching the Hugging Face hub when allowed."""
+    if MODEL_PATH:
+        if not os.path.isfile(MODEL_PATH):
+            raise FileNotFoundError(f"MODEL_PATH does not exist: {MODEL_PATH}")
+        return MODEL_PATH
+
+    local = os.path.join("models", MODEL_FILE)
+    if MODEL_OFFLINE and os.path.isfile(local):
+        return local
 
-    model_path = hf_hub_download(
+    # Imported lazily so air-gapped installs don't need huggingface_hub.
+    from huggingface_hub import hf_hub_download
+
+    return hf_hub_download(
         repo_id=MODEL_REPO,
         filename=MODEL_FILE,
         local_dir="models",
         local_dir_use_symlinks=False,
         force_filename=MODEL_FILE,
+        local_files_only=MODEL_OFFLINE,
     )
 
-    _LLM = Llama(
-        model_path=model_path,
-        n_ctx=N_CTX,
-        n_threads=N_THREADS,
-        n_gpu_layers=N_GPU_LAYERS,
-        verbose=False,
-    )
+
+def _load_llm() -> Llama:
+    """Resolve the GGUF file (downloading only if allowed) and initialize llama.cpp."""
+    global _LLM
+    if _LLM is not None:
+        return _LLM
+
+    with _LOAD_LOCK:
+        if _LLM is not None:
+            return _LLM
+        _MODEL_INFO["loading"] = True
+        start = time.perf_counter()
+        try:
+            model_path = _resolve_model_path()
+            llm = Llama(
+                model_path=model_path,
+                n_ctx=N_CTX,
+                n_threads=N_THREADS,
+                n_gpu_layers=N_GPU_LAYERS,
+                use_mmap=USE_MMAP,
+                use_mlock=USE_MLOCK,
+                verbose=False,
+            )
+        except Exception as e:
+            _MODEL_INFO["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _MODEL_INFO["loading"] = False
+        _MODEL_INFO.update(
+            model_path=model_path,
+            load_seconds=round(time.perf_counter() - start, 3),
+            error=None,
+        )
+        _LLM = llm
+    _refresh_cache_version()
     return _LLM
 
 
+class _ResultCache:
+    """SQLite memo of raw model answers keyed by input text + prompt version."""
+
+    EVICT_CHECK_EVERY = 512
+    # Hits only record last_used in memory; written out in batches of this size.
+    TOUCH_FLUSH_EVERY = 256
+
+    def __init__(self, path: str, version: str, max_rows: int) -> None:
+        self.path = path
+        self.version = version
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_results ("
+            " key TEXT PRIMARY KEY,"
+            " version TEXT NOT NULL,"
+            " input TEXT NOT NULL,"
+            " program TEXT NOT NULL,"
+            " university TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_results_last_used "
+            "ON llm_results (last_used)"
+        )
+        self._conn.commit()
+
+    def set_version(self, version: str) -> None:
+        """Key later lookups and stores under ``version``."""
+        with self._lock:
+            self.version = version
+
+    def _key(self, text: str) -> str:
+        """Hash the prompt version and normalized input into a row key."""
+        raw = f"{self.version}\x00{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, text: str) -> Tuple[str, str] | None:
+        """Return the cached (program, university) pair, or None on a miss."""
+        key = self._key(text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT program, university FROM llm_results WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.TOUCH_FLUSH_EVERY:
+                self._flush_touched()
+                self._conn.commit()
+        return row[0], row[1]
+
+    def flush(self) -> None:
+        """Write out the last_used times of recent hits."""
+        with self._lock:
+            if self._touched:
+                self._flush_touched()
+                self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Record pending hit timestamps in one statement (lock held)."""
+        self._conn.executemany(
+            "UPDATE llm_results SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def put(self, text: str, program: str, university: str) -> None:
+        """Store a model answer, evicting old rows once over capacity."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_results "
+                "(key, version, input, program, university, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(text), self.version, text,
+                    program, university, time.time(),
+                ),
+            )
+            self._puts += 1
+            if self._puts % self.EVICT_CHECK_EVERY == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop stale prompt versions, then least-recently-used rows (lock held)."""
+        self._flush_touched()
+        cur = self._conn.execute(
+            "DELETE FROM llm_results WHERE version != ?", (self.version,)
+        )
+        self.evictions += max(cur.rowcount, 0)
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_results").fetchone()
+        if count <= self.max_rows:
+            return
+        # Trim to 90% so we don't evict again on the very next check.
+        excess = count - int(self.max_rows * 0.9)
+        cur = self._conn.execute(
+            "DELETE FROM llm_results WHERE key IN ("
+            " SELECT key FROM llm_results ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += max(cur.rowcount, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current table size."""
+        with self._lock:
+            (rows,) = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_results"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "rows": rows,
+        }
+
+
+_CACHE: _ResultCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+# How each standardized row was answered: "rules", "cache" or "llm".
+PATH_COUNTS: Counter = Counter()
+
+# Model telemetry: "rows", "completion_tokens", "parse_failures".
+GEN_STATS: Counter = Counter()
+
+
+def _generation_stats() -> Dict[str, Any]:
+    """Model call counters plus the average tokens generated per row."""
+    rows = GEN_STATS["rows"]
+    return {
+        "grammar": USE_GRAMMAR,
+        "rows": rows,
+        "completion_tokens": GEN_STATS["completion_tokens"],
+        "avg_completion_tokens": (
+            round(GEN_STATS["completion_tokens"] / rows, 2) if rows else 0.0
+        ),
+        "parse_failures": GEN_STATS["parse_failures"],
+    }
+
+
+def _get_cache() -> _ResultCache | None:
+    """Open the result cache on first use; None when caching is disabled."""
+    global _CACHE
+    if _CACHE is None and CACHE_PATH:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = _ResultCache(CACHE_PATH, _prompt_version(), CACHE_MAX_ROWS)
+    return _CACHE
+
+
+def _program_of(row: Any) -> str:
+    """A row's ``program`` as text; rows arrive unvalidated, so coerce here."""
+    value = (row or {}).get("program") or ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _refresh_cache_version() -> None:
+    """Re-key the open cache once the model file is known to be in place.
+
+    The cache may open before a first run has downloaded the model, when the
+    fingerprint has no size or mtime yet. Answers are only stored after the
+    model has run, so refreshing here keeps them under the final version.
+    """
+    cache = _CACHE
+    if cache is not None:
+        cache.set_version(_prompt_version())
+
+
+def _normalize_program_text(text: str) -> str:
+    """Collapse whitespace so trivially different inputs share a cache key."""
+    return WHITESPACE_RE.sub(" ", text or "").strip()
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
-    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
-    parts = [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
+    s = WHITESPACE_RE.sub(" ", (text or "")).strip().strip(",")
+    parts = [p.strip() for p in SPLIT_RE.split(s) if p.strip()]
     prog = parts[0] if parts else ""
     uni = parts[1] if len(parts) > 1 else ""
 
@@ -156,18 +527,130 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     # Title-case program; normalize 'Of' → 'of' for universities
     prog = prog.title()
     if uni:
-        uni = re.sub(r"\bOf\b", "of", uni.title())
+        uni = TITLE_OF_RE.sub("of", uni.title())
     else:
         uni = "Unknown"
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
+def _canonical(name: str, exact: frozenset, folded: Dict[str, str]) -> str | None:
+    """Exact canonical hit, else a case-insensitive one, else None."""
+    if name in exact:
+        return name
+    return folded.get(name.casefold())
+
+
+def _expand_abbrev(uni: str) -> str:
+    """Expand a university abbreviation via the compiled ABBREV_UNI table."""
+    match = ABBREV_RE.fullmatch(uni)
+    return ABBREV_GROUPS[match.lastgroup] if match else uni
+
+
+def _rules_classify(program_text: str) -> Tuple[str, str] | None:
+    """Deterministic pre-classifier for inputs that need no model.
+
+    Splits like ``_split_fallback`` and only answers when the program and the
+    university both resolve to exact canonical names (after the common fixes
+    and abbreviation table). Anything ambiguous returns None for the LLM.
+    """
+    parts = [p.strip() for p in SPLIT_RE.split(program_text) if p.strip()]
+    if len(parts) != 2:
+        return None
+    prog, uni = parts
+
+    prog = _canonical(COMMON_PROG_FIXES.get(prog, prog), CANON_PROG_SET, CANON_PROG_FOLDED)
+    if prog is None:
+        return None
+    uni = _expand_abbrev(uni)
+    uni = COMMON_UNI_FIXES.get(uni, uni)
+    uni = _canonical(uni, CANON_UNI_SET, CANON_UNI_FOLDED)
+    if uni is None:
+        return None
+    return prog, uni
+
+
+class _FuzzyIndex:
+    """Index over a fixed candidate list that answers like difflib, only faster.
+
+    ``difflib.get_close_matches(name, candidates, n=1, cutoff)`` scores every
+    candidate. Here candidates are sorted by length, so the ``real_quick_ratio``
+    bound becomes a bisect range, and each one's character multiset is packed
+    into an int so the ``quick_ratio`` bound is a single AND + popcount. Only
+    survivors are scored with SequenceMatcher, best bound first, stopping once
+    no remaining bound can reach the best score. Since ratio <= quick_ratio <=
+    real_quick_ratio, the winner (ties broken like difflib) is identical.
+    """
+
+    def __init__(self, candidates: List[str]) -> None:
+        names = sorted(set(candidates), key=lambda c: (len(c), c))
+        counts = [Counter(c) for c in names]
+        self._names = names
+        self._lengths = [len(c) for c in names]
+        self._exact = set(names)
+        # One bit per occurrence: slot width is the highest count of any char.
+        self._width = max((max(c.values()) for c in counts), default=1)
+        self._slots: Dict[str, int] = {}
+        for c in counts:
+            for ch in c:
+                self._slots.setdefault(ch, len(self._slots) * self._width)
+        self._masks = [self._mask(c) for c in counts]
+        self.best = functools.lru_cache(maxsize=65536)(self._best)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _mask(self, counts: Counter) -> int:
+        """Pack a character multiset so popcount(a & b) is its intersection."""
+        mask = 0
+        for ch, n in counts.items():
+            offset = self._slots.get(ch)
+            if offset is not None:
+                mask |= ((1 << min(n, self._width)) - 1) << offset
+        return mask
+
+    def _best(self, name: str, cutoff: float) -> str | None:
+        """Best candidate with ratio >= cutoff, exactly as difflib picks it."""
+        size = len(name)
+        # Identical strings score 1.0 (autojunk only kicks in at 200 chars).
+        if size < 200 and name in self._exact:
+            return name
+
+        lo, hi = 0, len(self._names)
+        if cutoff > 0:
+            lo = bisect.bisect_left(self._lengths, int(cutoff * size / (2 - cutoff)))
+            hi = bisect.bisect_right(self._lengths, int(size * (2 - cutoff) / cutoff) + 1)
+
+        query = self._mask(Counter(name))
+        bounded = []
+        for i in range(lo, hi):
+            bound = 2.0 * (query & self._masks[i]).bit_count() / (size + self._lengths[i])
+            if bound >= cutoff:
+                bounded.append((bound, i))
+        bounded.sort(reverse=True)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(name)
+        # (score, name) of the best match so far; -1.0 means none yet.
+        best: Tuple[float, str] = (-1.0, "")
+        for bound, i in bounded:
+            if bound < best[0]:
+                break
+            matcher.set_seq1(self._names[i])
+            score = matcher.ratio()
+            if score >= cutoff and (score, self._names[i]) > best:
+                best = (score, self._names[i])
+        return best[1] if best[0] >= 0 else None
+
+
+UNI_INDEX = _FuzzyIndex(CANON_UNIS)
+PROG_INDEX = _FuzzyIndex(CANON_PROGS)
+
+
+def _best_match(name: str, index: _FuzzyIndex, cutoff: float = 0.86) -> str | None:
+    """Fuzzy match against a prebuilt index (same answer as difflib)."""
+    if not name or not index:
         return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+    return index.best(name, cutoff)
 
 
 def _post_normalize_program(prog: str) -> str:
@@ -175,9 +658,10 @@ def _post_normalize_program(prog: str) -> str:
     p = (prog or "").strip()
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
-    if p in CANON_PROGS:
-        return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    canon = _canonical(p, CANON_PROG_SET, CANON_PROG_FOLDED)
+    if canon is not None:
+        return canon
+    match = _best_match(p, PROG_INDEX, cutoff=0.84)
     return match or p
 
 
@@ -186,29 +670,25 @@ def _post_normalize_university(uni: str) -> str:
     u = (uni or "").strip()
 
     # Abbreviations
-    for pat, full in ABBREV_UNI.items():
-        if re.fullmatch(pat, u):
-            u = full
-            break
+    u = _expand_abbrev(u)
 
     # Common spelling fixes
     u = COMMON_UNI_FIXES.get(u, u)
 
     # Normalize 'Of' → 'of'
     if u:
-        u = re.sub(r"\bOf\b", "of", u.title())
+        u = TITLE_OF_RE.sub("of", u.title())
 
-    # Canonical or fuzzy map
-    if u in CANON_UNIS:
-        return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    # Canonical (exact, then case-insensitive) or fuzzy map
+    canon = _canonical(u, CANON_UNI_SET, CANON_UNI_FOLDED)
+    if canon is not None:
+        return canon
+    match = _best_match(u, UNI_INDEX, cutoff=0.86)
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
-
+def _messages(program_text: str) -> List[Dict[str, str]]:
+    """System prompt + few-shot exchanges + the row being standardized."""
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
     for x_in, x_out in FEW_SHOTS:
         messages.append(
@@ -226,14 +706,66 @@ def _call_llm(program_text: str) -> Dict[str, str]:
             "content": json.dumps({"program": program_text}, ensure_ascii=False),
         }
     )
+    return messages
+
 
-    out = llm.create_chat_completion(
-        messages=messages,
+def _prime_prefix(llm: Llama) -> None:
+    """Evaluate the shared prompt prefix ahead of the first row.
+
+    A one-token completion on an empty row evaluates the system prompt and
+    few-shots. llama.cpp keeps the evaluated tokens and only evaluates past
+    the longest common prefix on the next call, and every real row renders
+    to the same leading tokens, so each row pays only for its own suffix.
+    """
+    llm.create_chat_completion(
+        messages=_messages(""),
         temperature=0.0,
-        max_tokens=128,
-        top_p=1.0,
+        max_tokens=1,
     )
 
+
+def _warm_up() -> None:
+    """Load the model and evaluate the prompt prefix ahead of the first row."""
+    try:
+        llm = _load_llm()
+        if PREFIX_CACHE:
+            with _LLM_LOCK:
+                _prime_prefix(llm)
+        _MODEL_INFO["warm"] = True
+    except Exception as e:  # reported via /ready rather than crashing the server
+        print(f"Model warm-up failed: {e}", file=sys.stderr)
+
+
+def _json_grammar() -> LlamaGrammar:
+    """Compile the output grammar once per process."""
+    global _GRAMMAR
+    if _GRAMMAR is None:
+        _GRAMMAR = LlamaGrammar.from_string(JSON_GRAMMAR, verbose=False)
+    return _GRAMMAR
+
+
+def _generate(program_text: str) -> Tuple[str, str]:
+    """Run the model once and parse its raw (program, university) answer."""
+    llm = _load_llm()
+    grammar = _json_grammar() if USE_GRAMMAR else None
+
+    # llama.cpp contexts are not thread-safe. Consecutive rows share the
+    # prompt prefix, which llama.cpp's own prefix matching skips re-evaluating.
+    with _LLM_LOCK:
+        if not PREFIX_CACHE:
+            llm.reset()
+        out = llm.create_chat_completion(
+            messages=_messages(program_text),
+            temperature=0.0,
+            max_tokens=128,
+            top_p=1.0,
+            grammar=grammar,
+        )
+
+    GEN_STATS["rows"] += 1
+    GEN_STATS["completion_tokens"] += (out.get("usage") or {}).get(
+        "completion_tokens", 0
+    )
     text = (out["choices"][0]["message"]["content"] or "").strip()
     try:
         match = JSON_OBJ_RE.search(text)
@@ -241,16 +773,55 @@ def _call_llm(program_text: str) -> Dict[str, str]:
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
+        GEN_STATS["parse_failures"] += 1
         std_prog, std_uni = _split_fallback(program_text)
+    return std_prog, std_uni
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
+
+def _finalize(std_prog: str, std_uni: str) -> Dict[str, str]:
+    """Post-normalize a raw model answer into the output fields."""
     return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
+        "standardized_program": _post_normalize_program(std_prog),
+        "standardized_university": _post_normalize_university(std_uni),
     }
 
 
+def _lookup_fast(text: str) -> Dict[str, str] | None:
+    """Answer a normalized input from the rules path or the result cache."""
+    ruled = _rules_classify(text) if RULES_FIRST else None
+    if ruled is not None:
+        PATH_COUNTS["rules"] += 1
+        return {
+            "standardized_program": ruled[0],
+            "standardized_university": ruled[1],
+        }
+
+    cache = _get_cache()
+    cached = cache.get(text) if cache is not None else None
+    if cached is not None:
+        PATH_COUNTS["cache"] += 1
+        return _finalize(*cached)
+    return None
+
+
+def _remember(text: str, std_prog: str, std_uni: str) -> Dict[str, str]:
+    """Record a fresh model answer in the cache and finalize it."""
+    PATH_COUNTS["llm"] += 1
+    cache = _get_cache()
+    if cache is not None:
+        cache.put(text, std_prog, std_uni)
+    return _finalize(std_prog, std_uni)
+
+
+def _call_llm(program_text: str) -> Dict[str, str]:
+    """Query the tiny LLM (through the result cache) and return standardized fields."""
+    text = _normalize_program_text(program_text)
+    result = _lookup_fast(text)
+    if result is not None:
+        return result
+    return _remember(text, *_generate(text))
+
+
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     """Accept either a list of rows or {'rows': [...]}."""
     if isinstance(payload, list):
@@ -260,12 +831,63 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def _iter_ndjson(
+    lines: Iterable[bytes],
+) -> Iterator[Tuple[Dict[str, Any] | None, Dict[str, Any] | None]]:
+    """Yield ``(row, None)`` per valid NDJSON line, ``(None, error)`` per bad one.
+
+    Errors travel beside the rows rather than inside them, so an input row
+    that has its own ``error`` field is still standardized.
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield None, {"error": f"invalid JSON: {e.msg}", "line": number}
+            continue
+        if not isinstance(obj, dict):
+            yield None, {"error": "not an object", "line": number}
+        elif not isinstance(obj.get("program"), str):
+            yield None, {"error": "program must be a string", "line": number}
+        else:
+            yield obj, None
+
+
+def _micro_batches(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable of rows into lists of at most ``size``."""
+    batch: List[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 @app.get("/")
 def health() -> Any:
     """Simple liveness check."""
     return jsonify({"ok": True})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    """Readiness check: 200 once the model is loaded, 503 while it isn't."""
+    is_ready = _LLM is not None
+    body = {"ready": is_ready, **_MODEL_INFO}
+    return jsonify(body), 200 if is_ready else 503
+
+
+@app.get("/stats")
+def stats() -> Any:
+    """Report per-path row counts, cache hit rates and model token telemetry."""
+    return jsonify(run_stats())
+
+
 @app.post("/standardize")
 def standardize() -> Any:
     """Standardize rows from an HTTP request and return JSON."""
@@ -274,8 +896,7 @@ def standardize() -> Any:
 
     out: List[Dict[str, Any]] = []
     for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
+        result = _call_llm(_program_of(row))
         row["llm-generated-program"] = result["standardized_program"]
         row["llm-generated-university"] = result["standardized_university"]
         out.append(row)
@@ -283,40 +904,513 @@ def standardize() -> Any:
     return jsonify({"rows": out})
 
 
+@app.post("/standardize/stream")
+def standardize_stream() -> Any:
+    """Standardize NDJSON rows in micro-batches and stream NDJSON back.
+
+    The body is read lazily as the response is consumed, so a slow reader
+    throttles how far ahead the model runs and neither side buffers the whole
+    payload. Each micro-batch is deduplicated before hitting the cache/model.
+    """
+    items = _iter_ndjson(request.stream)
+
+    def generate() -> Iterator[str]:
+        for batch in _micro_batches(items, max(1, STREAM_BATCH_SIZE)):
+            keys = [
+                _normalize_program_text(row["program"]) if row is not None else None
+                for row, _ in batch
+            ]
+            todo = [key for key in keys if key is not None]
+            results = _standardize_distinct(list(dict.fromkeys(todo)))
+            chunk = []
+            for (row, error), key in zip(batch, keys):
+                out = error if row is None else _apply_result(row, results[key])
+                chunk.append(json.dumps(out, ensure_ascii=False) + "\n")
+            yield "".join(chunk)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+    )
+
+
+def _worker_init(
+    n_threads: int,
+    prefix_cache: bool,
+    model_path: str,
+    offline: bool,
+    use_grammar: bool,
+) -> None:
+    """Pool initializer: load this process's own, smaller model instance."""
+    global N_THREADS, PREFIX_CACHE, MODEL_PATH, MODEL_OFFLINE, USE_GRAMMAR
+    N_THREADS = n_threads
+    PREFIX_CACHE = prefix_cache
+    MODEL_PATH = model_path
+    MODEL_OFFLINE = offline
+    USE_GRAMMAR = use_grammar
+    _load_llm()
+
+
+def _worker_generate(
+    texts: List[str],
+) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Run the model over one shard (in a worker); return answers + telemetry."""
+    GEN_STATS.clear()
+    answers = [_generate(text) for text in texts]
+    return answers, dict(GEN_STATS)
+
+
+def _standardize_distinct(
+    texts: List[str],
+    workers: int = 1,
+    worker_threads: int = 0,
+) -> Dict[str, Dict[str, str]]:
+    """Standardize each distinct normalized program string exactly once.
+
+    With ``workers`` > 1, rules and cache hits are still answered here and only
+    the misses are sharded across a pool of processes, each running its own
+    model with ``worker_threads`` threads (default: cores / workers).
+    """
+    if workers <= 1:
+        return {text: _call_llm(text) for text in texts}
+
+    results: Dict[str, Dict[str, str]] = {}
+    pending: List[str] = []
+    for text in texts:
+        hit = _lookup_fast(text)
+        if hit is None:
+            pending.append(text)
+        else:
+            results[text] = hit
+    if not pending:
+        return results
+
+    threads = worker_threads or max(1, (os.cpu_count() or 2) // workers)
+    # Small shards keep every worker busy when some inputs are slower.
+    size = max(1, -(-len(pending) // (workers * 4)))
+    shards = [pending[i:i + size] for i in range(0, len(pending), size)]
+    print(
+        f"Worker pool: {len(pending)} model inputs over {workers} processes "
+        f"x {threads} threads",
+        file=sys.stderr,
+    )
+
+    # spawn, not fork: llama.cpp state and threads don't survive a fork.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_worker_init,
+        initargs=(threads, PREFIX_CACHE, MODEL_PATH, MODEL_OFFLINE, USE_GRAMMAR),
+    ) as pool:
+        for shard, (answers, gen) in zip(shards, pool.map(_worker_generate, shards)):
+            # The workers resolved (maybe downloaded) the model by now.
+            _refresh_cache_version()
+            GEN_STATS.update(gen)
+            for text, (std_prog, std_uni) in zip(shard, answers):
+                results[text] = _remember(text, std_prog, std_uni)
+    return results
+
+
+def _apply_result(row: Dict[str, Any], result: Dict[str, str]) -> Dict[str, Any]:
+    """Attach the standardized fields to a row (in place) and return it."""
+    row["llm-generated-program"] = result["standardized_program"]
+    row["llm-generated-university"] = result["standardized_university"]
+    return row
+
+
+def _dumps_line(row: Dict[str, Any]) -> str:
+    """One compact JSON line; orjson when installed, else stdlib."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(row).decode("utf-8") + "\n"
+        except TypeError:  # e.g. non-str keys; stdlib handles those
+            pass
+    return json.dumps(row, ensure_ascii=False) + "\n"
+
+
+class _JsonlWriter:
+    """Buffered JSONL writer with an optional durable checkpoint sidecar.
+
+    Rows are serialized compactly (one per line) unless ``pretty`` is set,
+    and handed to the sink in blocks once ``flush_bytes`` are pending or
+    ``flush_seconds`` have passed since the last flush (checked per row).
+
+    With ``checkpoint_path`` each flush fsyncs the output, then atomically
+    replaces a small JSON marker recording how many rows of ``source`` are
+    on disk and the byte offset they end at. A reader can trust everything
+    up to that offset even if the process dies mid-write. ``rows`` counts
+    input rows in order, including ones a resumed run passes to :meth:`skip`.
+
+    As a context manager it closes on success; if the block raises, rows
+    already queued are still flushed and the checkpoint stays incomplete.
+    """
+
+    def __init__(
+        self,
+        sink: Any,
+        pretty: bool = False,
+        flush_bytes: int = OUTPUT_FLUSH_BYTES,
+        flush_seconds: float = OUTPUT_FLUSH_SECONDS,
+        checkpoint_path: str | None = None,
+        source: Dict[str, Any] | None = None,
+        rows: int = 0,
+    ) -> None:
+        self.sink = sink
+        self.pretty = pretty
+        self.flush_bytes = flush_bytes
+        self.flush_seconds = flush_seconds
+        self.checkpoint_path = checkpoint_path
+        self.source = source or {}
+        self.rows = rows
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        if checkpoint_path:
+            self._checkpoint(complete=False)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Queue one row, flushing if a threshold has been reached."""
+        if self.pretty:
+            line = json.dumps(row, indent=4, ensure_ascii=False) + "\n"
+        else:
+            line = _dumps_line(row)
+        self._pending.append(line)
+        # The threshold is in encoded bytes, not characters.
+        self._pending_bytes += len(line) if line.isascii() else len(line.encode("utf-8"))
+        self._pending_rows += 1
+        if (
+            self._pending_bytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def skip(self) -> None:
+        """Count an input row that is already in the output."""
+        self._pending_rows += 1
+
+    def flush(self) -> None:
+        """Write pending rows to the sink and advance the checkpoint."""
+        if self._pending:
+            self.sink.write("".join(self._pending))
+            self._pending.clear()
+        self.sink.flush()
+        self.rows += self._pending_rows
+        self._pending_bytes = 0
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        if self.checkpoint_path:
+            self._checkpoint(complete=False)
+
+    def close(self) -> None:
+        """Flush remaining rows and mark the checkpoint complete."""
+        self.flush()
+        if self.checkpoint_path:
+            self._checkpoint(complete=True)
+
+    def __enter__(self) -> "_JsonlWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        """Close on success; on an error, still write out the queued rows."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.flush()
+
+    def _checkpoint(self, complete: bool) -> None:
+        """fsync the output, then atomically replace the marker file."""
+        fd = self.sink.fileno()
+        os.fsync(fd)
+        marker = {
+            **self.source,
+            "rows": self.rows,
+            "offset": os.fstat(fd).st_size,
+            "pretty": self.pretty,
+            "complete": complete,
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(marker, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+
+
+def _source_info(in_path: str) -> Dict[str, Any]:
+    """Identify an input file for the checkpoint (path, size and mtime)."""
+    st = os.stat(in_path)
+    return {
+        "input": os.path.abspath(in_path),
+        "input_size": st.st_size,
+        "input_mtime_ns": st.st_mtime_ns,
+    }
+
+
+def _resume_checkpoint(
+    checkpoint_path: str, out_path: str, source: Dict[str, Any]
+) -> Dict[str, Any] | None:
+    """Return the checkpoint if it describes ``source`` and fits the output."""
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(marker, dict):
+        return None
+    if any(marker.get(k) != v for k, v in source.items()):
+        return None
+    if not 0 <= int(marker.get("offset", -1)) <= os.path.getsize(out_path):
+        return None
+    return marker
+
+
+def _scan_output(path: str) -> Tuple[set, int]:
+    """Collect row URLs already in a (compact or pretty) JSONL output file.
+
+    Returns the URLs and the byte offset just past the last complete record,
+    so a half-written tail from a crashed run can be cut off. A line starting
+    with ``{`` in column 0 always begins a new record, which keeps one bad
+    record from swallowing the rest of the file.
+    """
+    urls = set()
+    good = 0
+    offset = 0
+    buf = b""
+    with open(path, "rb") as f:
+        for line in f:
+            offset += len(line)
+            if line.startswith(b"{"):
+                buf = line
+            elif buf:
+                buf += line
+            else:
+                if not line.strip():
+                    good = offset
+                continue
+            try:
+                obj = json.loads(buf)
+            except ValueError:
+                continue
+            buf = b""
+            good = offset
+            if isinstance(obj, dict) and obj.get("url"):
+                urls.add(obj["url"])
+    return urls, good
+
+
+def _truncate(path: str, offset: int) -> None:
+    """Cut a file back to ``offset`` bytes if it is longer."""
+    if os.path.getsize(path) > offset:
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+
+
+def _write_row(writer: _JsonlWriter, row: Dict[str, Any], result: Dict[str, str]) -> None:
+    """Attach the standardized fields to a row and queue it on the writer."""
+    writer.write(_apply_result(row, result))
+
+
 def _cli_process_file(
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    batch: bool = False,
+    workers: int = 1,
+    worker_threads: int = 0,
+    pretty: bool = False,
+    resume: bool = True,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    """Process a JSON file and write JSONL incrementally.
 
+    Output is compact JSON Lines through a buffered :class:`_JsonlWriter`
+    (``pretty`` restores the old ``indent=4`` records). File output also
+    keeps a ``<out>.ckpt`` marker unless ``CHECKPOINT=0``.
+
+    When appending with ``resume`` set, rows already in the output are not
+    reprocessed: an incomplete checkpoint for this same input, with a partial
+    tail past its offset, truncates the output to that offset and restarts
+    after its row count; otherwise the output is scanned and rows whose
+    ``url`` is already there are skipped.
+
+    With ``batch`` set, rows are first grouped by normalized ``program`` text,
+    each distinct value is standardized once, and the results are fanned back
+    out to every row in the original order. ``workers`` > 1 implies batch mode
+    and shards the model calls across that many processes.
+    """
+    rows = load_rows(in_path)
+
+    source = _source_info(in_path)
     sink = sys.stdout if to_stdout else None
+    checkpoint_path = None
+    start = 0
+    done_urls: set = set()
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
+        if CHECKPOINT:
+            checkpoint_path = out_path + ".ckpt"
+        if append and resume and os.path.exists(out_path):
+            marker = None
+            if checkpoint_path:
+                marker = _resume_checkpoint(checkpoint_path, out_path, source)
+            # Only an interrupted run's marker is trusted to cut the file: a
+            # complete one may have had other rows appended after it.
+            if (
+                marker
+                and not marker.get("complete")
+                and os.path.getsize(out_path) > int(marker["offset"])
+            ):
+                _truncate(out_path, marker["offset"])
+                start = min(int(marker["rows"]), len(rows))
+            else:
+                done_urls, end = _scan_output(out_path)
+                _truncate(out_path, end)
         mode = "a" if append else "w"
         sink = open(out_path, mode, encoding="utf-8")
 
     assert sink is not None  # for type-checkers
 
+    pending = [
+        i for i in range(start, len(rows))
+        if not done_urls or (rows[i] or {}).get("url") not in done_urls
+    ]
+    if len(pending) < len(rows):
+        print(
+            f"Resuming: {len(rows) - len(pending)} of {len(rows)} rows "
+            f"already in {out_path}",
+            file=sys.stderr,
+        )
+    todo = set(pending)
+
     try:
-        
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, indent=4, ensure_ascii=False)
-            sink.write("\n")
-            sink.flush()
-            
+        with _JsonlWriter(
+            sink,
+            pretty=pretty,
+            checkpoint_path=checkpoint_path,
+            source=source,
+            rows=start,
+        ) as writer:
+            if batch or workers > 1:
+                keys = {
+                    i: _normalize_program_text(_program_of(rows[i]))
+                    for i in pending
+                }
+                distinct = list(dict.fromkeys(keys.values()))
+                print(
+                    f"Batch mode: {len(pending)} rows, {len(distinct)} distinct programs",
+                    file=sys.stderr,
+                )
+                results = _standardize_distinct(distinct, workers, worker_threads)
+                for i in range(start, len(rows)):
+                    if i in todo:
+                        _write_row(writer, rows[i], results[keys[i]])
+                    else:
+                        writer.skip()
+            else:
+                for i in range(start, len(rows)):
+                    if i not in todo:
+                        writer.skip()
+                        continue
+                    _write_row(writer, rows[i], _call_llm(_program_of(rows[i])))
     finally:
         if sink is not sys.stdout:
             sink.close()
 
+    print(f"Standardizer paths: {json.dumps(dict(PATH_COUNTS))}", file=sys.stderr)
+    print(f"Generation: {json.dumps(_generation_stats())}", file=sys.stderr)
+    cache = _get_cache()
+    if cache is not None:
+        cache.flush()
+        print(f"LLM cache: {json.dumps(cache.stats())}", file=sys.stderr)
+
+
+# ---------------- In-process hooks ----------------
+# Per-row stages ``instrument`` can wrap; _call_llm covers everything a row
+# goes through.
+STAGES = (
+    "_call_llm",
+    "_rules_classify",
+    "_generate",
+    "_post_normalize_program",
+    "_post_normalize_university",
+    "_write_row",
+)
+
+
+def load_rows(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON input file (list of rows or {'rows': [...]})."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return _normalize_input(
+        orjson.loads(data) if orjson is not None else json.loads(data)
+    )
+
+
+def program_key(program_text: str) -> str:
+    """The normalized text rows are deduplicated and cached under."""
+    return _normalize_program_text(program_text)
+
+
+def process_file(
+    in_path: str,
+    out_path: str | None = None,
+    append: bool = False,
+    to_stdout: bool = False,
+    **options: Any,
+) -> None:
+    """Standardize a JSON file to JSONL in this process, as ``--file`` does."""
+    _cli_process_file(in_path, out_path, append, to_stdout, **options)
+
+
+def instrument(
+    wrap: Callable[[str, Callable[..., Any]], Callable[..., Any]],
+    stages: Iterable[str] = STAGES,
+) -> None:
+    """Replace each named stage with ``wrap(name, stage)``.
+
+    Stages are looked up as module globals on every call, so the wrappers see
+    the CLI, batch and HTTP paths alike.
+    """
+    namespace = globals()
+    for name in stages:
+        if name not in STAGES:
+            raise ValueError(f"unknown stage: {name}")
+        namespace[name] = wrap(name, namespace[name])
+
+
+def use_rules_only() -> None:
+    """Answer model misses with the rules fallback instead of inference.
+
+    For measuring everything around the model. Fallback answers still go
+    through the result cache under the real prompt version, so point
+    :func:`reset_run` at a scratch cache (or "") first.
+    """
+    global _generate
+    _generate = _split_fallback
+
+
+def reset_run(cache_path: str) -> None:
+    """Reopen the result cache at ``cache_path`` ("" disables it) and zero counters."""
+    global CACHE_PATH, _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is not None:
+            _CACHE.flush()
+        CACHE_PATH = cache_path
+        _CACHE = None
+    PATH_COUNTS.clear()
+    GEN_STATS.clear()
+
+
+def run_stats() -> Dict[str, Any]:
+    """Per-path row counts, cache hit rates and model token telemetry."""
+    cache = _get_cache()
+    return {
+        "paths": dict(PATH_COUNTS),
+        "cache": cache.stats() if cache is not None else None,
+        "generation": _generation_stats(),
+    }
+
 
 if __name__ == "__main__":
     import argparse
@@ -343,17 +1437,92 @@ if __name__ == "__main__":
     parser.add_argument(
         "--append",
         action="store_true",
-        help="Append to the output file instead of overwriting.",
+        help="Append to the output file instead of overwriting, "
+        "skipping rows that are already in it.",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="With --append, reprocess every row even if it is already in the output.",
     )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write indented multi-line JSON records instead of compact JSONL.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Standardize each distinct program once, then fan results out "
+        "to every row in input order.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Model processes for batch mode (implies --batch when > 1).",
+    )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=WORKER_THREADS,
+        help="llama.cpp threads per worker (default: cores / workers).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the persistent LLM result cache for this run.",
+    )
+    parser.add_argument(
+        "--no-rules",
+        action="store_true",
+        help="Send every row to the model, even exact canonical matches.",
+    )
+    parser.add_argument(
+        "--model-path",
+        default=None,
+        help="Local GGUF file to load (skips the Hugging Face hub entirely).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never hit the network; use models/ or the local HF cache.",
+    )
+    parser.add_argument(
+        "--no-grammar",
+        action="store_true",
+        help="Let the model generate free text instead of grammar-constrained JSON.",
+    )
+    parser.add_argument(
+        "--no-prefix-cache",
+        action="store_true",
+        help="Re-evaluate the few-shot prompt prefix for every row.",
+    )
     args = parser.parse_args()
 
+    if args.no_cache:
+        CACHE_PATH = ""
+    if args.no_rules:
+        RULES_FIRST = False
+    if args.no_prefix_cache:
+        PREFIX_CACHE = False
+    if args.no_grammar:
+        USE_GRAMMAR = False
+
+    if args.model_path:
+        MODEL_PATH = args.model_path
+    if args.offline:
+        MODEL_OFFLINE = True
+
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
+        if PRELOAD_MODEL:
+            threading.Thread(target=_warm_up, daemon=True).start()
         app.run(host="0.0.0.0", port=port, debug=False)
     else:
         _cli_process_file(
@@ -361,4 +1530,9 @@ if __name__ == "__main__":
             out_path=args.out,
             append=bool(args.append),
             to_stdout=bool(args.stdout),
+            batch=bool(args.batch),
+            workers=args.workers,
+            worker_threads=args.worker_threads,
+            pretty=bool(args.pretty),
+            resume=not args.no_resume,
         )
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the standardizer's hot paths.
+
+Usage:
+    python bench.py fuzzy [--queries 5000] [--seed 0]
+    python bench.py pipeline [--expand 5000] [--batch] [--no-llm]
+                             [--out bench_pipeline.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+import app
+
+
+def _mutate(name: str, rng: random.Random) -> str:
+    """Apply 0-3 random typos (substitute/delete/insert) to a name."""
+    chars = list(name)
+    for _ in range(rng.randint(0, 3)):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice(string.ascii_lowercase + " ")
+        elif op < 0.7:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def _fuzzy_queries(candidates: List[str], count: int, rng: random.Random) -> List[str]:
+    """Typo'd, re-cased and unmatched names, roughly like post-LLM output."""
+    queries = []
+    for _ in range(count):
+        name = rng.choice(candidates)
+        roll = rng.random()
+        if roll < 0.6:
+            queries.append(_mutate(name, rng))
+        elif roll < 0.9:
+            queries.append(name.title())
+        else:
+            queries.append(_mutate("Unknown Institute of Nowhere", rng))
+    return queries
+
+
+def bench_fuzzy(count: int, seed: int) -> Dict[str, Any]:
+    """Time difflib.get_close_matches against the prebuilt fuzzy indexes."""
+    rng = random.Random(seed)
+    report: Dict[str, Any] = {}
+    for label, candidates, index, cutoff in (
+        ("universities", app.CANON_UNIS, app.UNI_INDEX, 0.86),
+        ("programs", app.CANON_PROGS, app.PROG_INDEX, 0.84),
+    ):
+        queries = _fuzzy_queries(candidates, count, rng)
+
+        start = time.perf_counter()
+        expected = []
+        for q in queries:
+            matches = difflib.get_close_matches(q, candidates, n=1, cutoff=cutoff)
+            expected.append(matches[0] if matches else None)
+        difflib_s = time.perf_counter() - start
+
+        index.best.cache_clear()
+        start = time.perf_counter()
+        got = [index.best(q, cutoff) for q in queries]
+        index_s = time.perf_counter() - start
+
+        report[label] = {
+            "candidates": len(candidates),
+            "queries": len(queries),
+            "difflib_ms_per_query": round(difflib_s * 1000 / len(queries), 4),
+            "index_ms_per_query": round(index_s * 1000 / len(queries), 4),
+            "speedup": round(difflib_s / index_s, 1) if index_s else None,
+            "mismatches": sum(a != b for a, b in zip(expected, got)),
+        }
+    return report
+
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_data.json")
+
+def _percentiles(samples: List[float]) -> Dict[str, Any]:
+    """Count, mean and nearest-rank percentiles of durations, in ms."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) * 1000 / len(ordered), 4),
+        "p50_ms": round(rank(0.50), 4),
+        "p90_ms": round(rank(0.90), 4),
+        "p99_ms": round(rank(0.99), 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def _synthetic_rows(rows: List[Dict[str, Any]], count: int, seed: int) -> List[Dict[str, Any]]:
+    """Expand sample rows into ``count`` rows with realistic repetition.
+
+    Most rows pair a canonical program with a canonical university (so the
+    same strings recur, as in real updates); the rest add abbreviations,
+    odd casing/spacing and typos, or replay the original samples.
+    """
+    rng = random.Random(seed)
+    unis = app.CANON_UNIS or ["Unknown"]
+    progs = app.CANON_PROGS or ["Unknown"]
+    # A popular subset repeats heavily, like the real data.
+    hot = [(rng.choice(progs), rng.choice(unis)) for _ in range(max(1, count // 50))]
+    out = []
+    for i in range(count):
+        row = dict(rows[i % len(rows)]) if rows else {}
+        roll = rng.random()
+        if roll < 0.55:
+            prog, uni = rng.choice(hot)
+            text = f"{prog}, {uni}"
+        elif roll < 0.70:
+            prog, uni = rng.choice(hot)
+            text = f"  {prog.lower()} ,{uni.upper()}  "
+        elif roll < 0.80:
+            text = f"{rng.choice(progs)}, {rng.choice(['McG', 'UBC', 'uoft', 'Mcgill'])}"
+        elif roll < 0.95:
+            text = f"{_mutate(rng.choice(progs), rng)}, {_mutate(rng.choice(unis), rng)}"
+        else:
+            text = row.get("program") or ""
+        row["program"] = text
+        row["url"] = f"https://example.invalid/result/{i}"
+        out.append(row)
+    return out
+
+
+def _timed(fn: Callable[..., Any], sink: List[float]) -> Callable[..., Any]:
+    """Wrap ``fn`` so each call's duration is appended to ``sink``."""
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sink.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def bench_pipeline(
+    rows: List[Dict[str, Any]],
+    batch: bool,
+    no_llm: bool,
+    cache_path: str | None,
+) -> Dict[str, Any]:
+    """Replay rows through the CLI path with per-stage timers installed."""
+    if no_llm and cache_path is not None:
+        # Fallback splits would be stored under the real prompt version.
+        raise ValueError("--no-llm always runs against a scratch cache")
+    timings: Dict[str, List[float]] = defaultdict(list)
+    if no_llm:
+        # Everything except inference: parse with the rules fallback instead.
+        app.use_rules_only()
+    app.instrument(lambda name, fn: _timed(fn, timings[name]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_path = os.path.join(tmp, "rows.json")
+        out_path = os.path.join(tmp, "rows.jsonl")
+        with open(in_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+
+        # A fresh cache per run unless one is given, so hit rates are comparable.
+        if cache_path is None:
+            cache_path = os.path.join(tmp, "cache.sqlite3")
+        app.reset_run(cache_path)
+
+        start = time.perf_counter()
+        app.process_file(in_path, out_path, batch=batch)
+        elapsed = time.perf_counter() - start
+        output_bytes = os.path.getsize(out_path)
+        stats = app.run_stats()
+
+    distinct = {app.program_key(r.get("program") or "") for r in rows}
+    return {
+        "rows": len(rows),
+        "distinct_programs": len(distinct),
+        "batch": batch,
+        "no_llm": no_llm,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(len(rows) / elapsed, 2) if elapsed else None,
+        "output_bytes": output_bytes,
+        "stages": {name: _percentiles(timings[name]) for name in app.STAGES},
+        **stats,
+    }
+
+
+def _compare(report: Dict[str, Any], baseline_path: str, tolerance: float) -> bool:
+    """Print the rows/sec change vs a saved report; False on a regression."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    old, new = baseline.get("rows_per_sec"), report.get("rows_per_sec")
+    if not old or not new:
+        print("Baseline has no rows_per_sec to compare against.", file=sys.stderr)
+        return True
+    change = (new - old) / old
+    print(f"rows/sec: {old} -> {new} ({change:+.1%})", file=sys.stderr)
+    return change >= -tolerance
+
+
+def main() -> None:
+    """Parse arguments and print the selected benchmark as JSON."""
+    parser = argparse.ArgumentParser(description="Standardizer benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fuzzy = sub.add_parser("fuzzy", help="Fuzzy index vs difflib baseline.")
+    fuzzy.add_argument("--queries", type=int, default=5000)
+    fuzzy.add_argument("--seed", type=int, default=0)
+
+    pipeline = sub.add_parser(
+        "pipeline", help="Rows/sec and per-stage latency of the CLI path."
+    )
+    pipeline.add_argument("--input", default=SAMPLE_PATH, help="JSON rows to replay.")
+    pipeline.add_argument(
+        "--expand", type=int, default=0,
+        help="Synthesize this many rows from the input (0 = replay as-is).",
+    )
+    pipeline.add_argument("--seed", type=int, default=0)
+    pipeline.add_argument("--batch", action="store_true", help="Use CLI batch mode.")
+    pipeline.add_argument(
+        "--no-llm", action="store_true",
+        help="Skip inference (rules fallback) to measure the surrounding overhead.",
+    )
+    pipeline.add_argument(
+        "--cache", default=None,
+        help="Result cache to use (default: a fresh, empty one per run). "
+        "Not allowed with --no-llm.",
+    )
+    pipeline.add_argument("--out", default=None, help="Save the report as JSON here.")
+    pipeline.add_argument("--compare", default=None, help="Baseline report to compare with.")
+    pipeline.add_argument(
+        "--tolerance", type=float, default=0.10,
+        help="Allowed rows/sec drop vs --compare before exiting non-zero.",
+    )
+
+    args = parser.parse_args()
+    if args.command == "fuzzy":
+        print(json.dumps(bench_fuzzy(args.queries, args.seed), indent=4))
+    elif args.command == "pipeline":
+        if args.no_llm and args.cache is not None:
+            pipeline.error("--cache cannot be combined with --no-llm")
+        rows = app.load_rows(args.input)
+        if args.expand:
+            rows = _synthetic_rows(rows, args.expand, args.seed)
+        report = bench_pipeline(rows, args.batch, args.no_llm, args.cache)
+        print(json.dumps(report, indent=4))
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4)
+        if args.compare and not _compare(report, args.compare, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Tests for the SQLite result cache."""
+
+import os
+
+import pytest
+
+# app.py needs llama_cpp at import time; skip where it isn't installed.
+app = pytest.importorskip("app")
+
+# pylint: disable=protected-access
+
+
+def test_hit_miss_and_version_invalidation(tmp_path):
+    """Stored answers hit under their version only; stale versions are evicted."""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = app._ResultCache(path, "v1", max_rows=100)
+
+    assert cache.get("computer science, mcgill") is None
+    cache.put("computer science, mcgill", "Computer Science", "McGill University")
+    assert cache.get("computer science, mcgill") == (
+        "Computer Science",
+        "McGill University",
+    )
+    cache.flush()
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A new prompt/model version never sees the old answers...
+    newer = app._ResultCache(path, "v2", max_rows=100)
+    assert newer.get("computer science, mcgill") is None
+    newer.put("math, ubc", "Mathematics", "University of British Columbia")
+    assert newer.stats()["rows"] == 2
+
+    # ...and drops them on its next eviction pass.
+    newer.EVICT_CHECK_EVERY = 1
+    newer.put("physics, ubc", "Physics", "University of British Columbia")
+    assert newer.stats()["rows"] == 2
+    assert newer.stats()["evictions"] == 1
+    assert newer.get("math, ubc") == ("Mathematics", "University of British Columbia")
+
+
+def test_get_cache_defaults_next_to_module(monkeypatch, tmp_path):
+    """The default path does not depend on the working directory."""
+    if "LLM_CACHE_PATH" not in os.environ:
+        assert os.path.dirname(app.CACHE_PATH) == app._HERE
+
+    monkeypatch.setattr(app, "CACHE_PATH", str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(app, "_CACHE", None)
+    cache = app._get_cache()
+    assert cache is app._get_cache()
+    assert cache.path == str(tmp_path / "c.sqlite3")
+
+
+def test_version_is_refreshed_once_the_model_exists(monkeypatch, tmp_path):
+    """Answers stored after a first download are keyed on the real file."""
+    model = tmp_path / "model.gguf"
+    monkeypatch.setattr(app, "MODEL_PATH", str(model))
+    monkeypatch.setattr(app, "CACHE_PATH", str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(app, "_CACHE", None)
+    cache = app._get_cache()
+    before = cache.version
+
+    model.write_bytes(b"GGUF")
+    app._refresh_cache_version()
+
+    assert cache.version != before
+    assert cache.version == app._prompt_version()
@@ -0,0 +1,27 @@
+"""The fuzzy index must pick exactly what difflib.get_close_matches picks."""
+
+import difflib
+import random
+
+import pytest
+
+# app.py needs llama_cpp at import time; skip where it isn't installed.
+app = pytest.importorskip("app")
+bench = pytest.importorskip("bench")
+
+
+@pytest.mark.parametrize(
+    "candidates, cutoff",
+    [(app.CANON_UNIS, 0.86), (app.CANON_PROGS, 0.84), (app.CANON_PROGS, 0.6)],
+    ids=["universities", "programs", "programs-difflib-default"],
+)
+def test_index_matches_difflib(candidates, cutoff):
+    """Typo'd, re-cased and unmatched names over the canonical lists."""
+    index = app._FuzzyIndex(candidates)  # pylint: disable=protected-access
+    rng = random.Random(0)
+    queries = bench._fuzzy_queries(candidates, 400, rng)  # pylint: disable=protected-access
+    queries += ["", "x", candidates[0], candidates[-1].upper()]
+
+    for query in queries:
+        matches = difflib.get_close_matches(query, candidates, n=1, cutoff=cutoff)
+        assert index.best(query, cutoff) == (matches[0] if matches else None), query
@@ -0,0 +1,52 @@
+"""Tests for the /standardize and /standardize/stream endpoints."""
+
+import json
+
+import pytest
+
+# app.py needs llama_cpp at import time; skip where it isn't installed.
+app = pytest.importorskip("app")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A test client that answers model misses with the rules fallback."""
+    monkeypatch.setattr(app, "_generate", app._split_fallback)  # pylint: disable=protected-access
+    monkeypatch.setattr(app, "CACHE_PATH", "")
+    monkeypatch.setattr(app, "_CACHE", None)
+    return app.app.test_client()
+
+
+# pylint: disable=redefined-outer-name
+
+
+def test_bad_rows_come_back_in_place(client):
+    """A non-string program is rejected without cutting off later rows."""
+    lines = [
+        {"program": "Computer Science, McGill University", "url": "a"},
+        {"program": 5, "url": "b"},
+        "not an object",
+        {"program": "Mathematics, UBC", "url": "c", "error": "scraper timeout"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+
+    res = client.post("/standardize/stream", data=body)
+    rows = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+
+    assert res.status_code == 200
+    assert len(rows) == 5
+    assert rows[0]["llm-generated-university"] == "McGill University"
+    assert rows[1] == {"error": "program must be a string", "line": 2}
+    assert rows[2] == {"error": "not an object", "line": 3}
+    # An input row's own "error" field does not stop it being standardized.
+    assert rows[3]["error"] == "scraper timeout"
+    assert rows[3]["llm-generated-university"] == "University of British Columbia"
+    assert rows[4]["line"] == 5 and rows[4]["error"].startswith("invalid JSON")
+
+
+def test_non_string_program_is_coerced(client):
+    """/standardize keeps handling programs that are not strings."""
+    res = client.post("/standardize", json={"rows": [{"program": 5}, {"program": None}]})
+
+    assert res.status_code == 200
+    assert [row["program"] for row in res.get_json()["rows"]] == [5, None]
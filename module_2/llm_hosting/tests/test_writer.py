@@ -0,0 +1,44 @@
+"""Tests for the buffered JSONL writer."""
+
+import io
+import json
+
+import pytest
+
+# app.py needs llama_cpp at import time; skip where it isn't installed.
+app = pytest.importorskip("app")
+
+# pylint: disable=protected-access
+
+
+def test_flush_threshold_counts_encoded_bytes():
+    """Non-ASCII rows reach the byte threshold by their UTF-8 size."""
+    sink = io.StringIO()
+    writer = app._JsonlWriter(sink, flush_bytes=30, flush_seconds=3600)
+
+    writer.write({"u": "a" * 12})  # 21 bytes
+    assert sink.getvalue() == ""
+    writer.flush()
+    writer.write({"u": "é" * 12})  # 21 characters, but 33 bytes
+    assert sink.getvalue().count("\n") == 2
+
+
+def test_queued_rows_are_written_when_the_run_fails(tmp_path, monkeypatch):
+    """Rows finished before an exception still reach the output file."""
+    rows = [{"program": f"Program {i}, McGill", "url": f"u{i}"} for i in range(5)]
+    in_path = tmp_path / "rows.json"
+    in_path.write_text(json.dumps(rows), encoding="utf-8")
+    out_path = tmp_path / "rows.jsonl"
+    monkeypatch.setattr(app, "CACHE_PATH", "")
+    monkeypatch.setattr(app, "_CACHE", None)
+
+    def failing(program_text):
+        if program_text.startswith("Program 3"):
+            raise RuntimeError("model crashed")
+        return {"standardized_program": "P", "standardized_university": "U"}
+
+    monkeypatch.setattr(app, "_call_llm", failing)
+    with pytest.raises(RuntimeError):
+        app.process_file(str(in_path), str(out_path))
+
+    assert out_path.read_text(encoding="utf-8").count("\n") == 3
@@ -0,0 +1,199 @@
+"""
+Benchmarks for the end-to-end analytics path on synthetic data.
+
+For each dataset size this times, against the PostgreSQL at DATABASE_URL:
+
+- load: `load_data.load_applicant_data` (drop, create, COPY);
+- metrics: `query_data._fetch_metrics` on one cursor;
+- index: a GET of the dashboard `/` route through Flask's test client.
+
+Each step runs `--repeat` times, and its median is compared with the stored
+baseline (`baselines.json` next to this file). The run exits with status 1
+when a median is slower than the baseline by more than `--tolerance` and by
+more than `--min-delta` seconds, so small timings do not fail on noise.
+`--update-baseline` records the current medians instead.
+
+Usage::
+
+    DATABASE_URL=postgresql://localhost/bench \\
+        python -m module_5.benchmarks.run --sizes 10k,100k --repeat 3
+
+The benchmark replaces the `applicants` table; point it at a scratch
+database.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import psycopg
+from module_5.benchmarks.synthetic import SIZES, ensure_dataset
+from module_5.src.load_data import load_applicant_data
+from module_5.src.query_data import _fetch_metrics
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DATA_DIR = os.path.join(tempfile.gettempdir(), "module_5_bench")
+STEPS = ("load", "metrics", "index")
+
+
+def _timings(fn, repeat):
+    """
+    Runs `fn` `repeat` times.
+
+    Returns:
+        dict: median, min and every run, in seconds.
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {
+        "median_s": round(statistics.median(runs), 6),
+        "min_s": round(min(runs), 6),
+        "runs_s": [round(r, 6) for r in runs],
+    }
+
+
+def _dashboard_client(database_url):
+    """Imports the dashboard app (which opens its pool) and returns a client."""
+    os.environ["DATABASE_URL"] = database_url
+    # Imported here: the module connects to DATABASE_URL at import time.
+    # pylint: disable=import-outside-toplevel
+    from module_5.src.front_end.app import app
+    return app.test_client()
+
+
+def _get_index(client):
+    """Renders the dashboard once, failing loudly on an error page."""
+    response = client.get("/")
+    if response.status_code != 200:
+        raise RuntimeError(f"GET / returned HTTP {response.status_code}")
+
+
+def bench_size(database_url, rows, repeat, data_dir=DATA_DIR, seed=0):
+    """
+    Benchmarks one dataset size.
+
+    Args:
+        database_url (str): Scratch database to load into.
+        rows (int): Number of synthetic rows.
+        repeat (int): Runs per step.
+        data_dir (str): Where generated datasets are cached.
+        seed (int): Dataset seed.
+
+    Returns:
+        dict: Timings per step.
+    """
+    path = ensure_dataset(data_dir, rows, seed)
+    results = {
+        "load": _timings(lambda: load_applicant_data(database_url, path), repeat)
+    }
+    with psycopg.connect(database_url) as conn, conn.cursor() as cur:
+        cur.execute("ANALYZE applicants")
+        results["metrics"] = _timings(lambda: _fetch_metrics(cur), repeat)
+    client = _dashboard_client(database_url)
+    results["index"] = _timings(lambda: _get_index(client), repeat)
+    return results
+
+
+def compare(report, baseline, tolerance, min_delta):
+    """
+    Compares step medians with a baseline.
+
+    Args:
+        report (dict): {size: {step: {"median_s": ...}}} from this run.
+        baseline (dict): {size: {step: median seconds}}.
+        tolerance (float): Allowed slowdown as a fraction, e.g. 0.2.
+        min_delta (float): Slowdowns under this many seconds are ignored.
+
+    Returns:
+        list: One message per regression (empty when none).
+    """
+    regressions = []
+    for size, steps in report.items():
+        for step, timing in steps.items():
+            old = baseline.get(size, {}).get(step)
+            if not old:
+                continue
+            new = timing["median_s"]
+            change = (new - old) / old
+            print(f"{size} {step}: {old:.4f}s -> {new:.4f}s ({change:+.1%})")
+            if change > tolerance and new - old > min_delta:
+                regressions.append(
+                    f"{size} {step} regressed {change:+.1%} ({old:.4f}s -> {new:.4f}s)"
+                )
+    return regressions
+
+
+def _medians(report):
+    """Reduces a report to {size: {step: median}} for the baseline file."""
+    return {
+        size: {step: timing["median_s"] for step, timing in steps.items()}
+        for size, steps in report.items()
+    }
+
+
+def main(argv=None):
+    """Runs the benchmarks and returns the process exit status."""
+    parser = argparse.ArgumentParser(description="module_5 analytics benchmarks.")
+    parser.add_argument(
+        "--sizes", default="10k,100k",
+        help=f"Comma-separated sizes from {', '.join(SIZES)}.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-delta", type=float, default=0.005)
+    parser.add_argument("--out", default=None, help="Save the full report as JSON here.")
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="Store this run's medians as the baseline instead of comparing.",
+    )
+    args = parser.parse_args(argv)
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        parser.error("DATABASE_URL must point at a scratch PostgreSQL database.")
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    report = {
+        size: bench_size(database_url, SIZES[size], args.repeat, args.data_dir, args.seed)
+        for size in sizes
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline.update(_medians(report))
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    regressions = compare(report, baseline, args.tolerance, args.min_delta)
+    for message in regressions:
+        print(f"REGRESSION: {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
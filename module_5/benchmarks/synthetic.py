@@ -0,0 +1,89 @@
+"""
+Synthetic applicant data for the benchmarks.
+
+`generate_rows` yields rows in the same JSON layout as the scraped and
+LLM-standardized files (`record.JSON_KEYS`), with value mixes close to the
+real data. That includes the universities, programs, degrees and terms the
+dashboard queries filter on, so every query has matches. Output is
+deterministic for a given seed.
+"""
+import os
+import random
+from module_5.src import line_index
+
+UNIVERSITIES = (
+    "Johns Hopkins University", "Georgetown University",
+    "University of Chicago", "Boston University", "Stanford University",
+    "Massachusetts Institute of Technology", "University of Michigan",
+    "Carnegie Mellon University", "University of Toledo",
+    "University of Southern California",
+)
+PROGRAMS = (
+    "Computer Science", "Mechanical Engineering", "Economics", "Biology",
+    "Mathematics", "Physics", "Psychology", "Public Health",
+)
+DEGREES = ("Masters", "PhD", "MFA", "JD", "PsyD")
+TERMS = ("Fall 2023", "Spring 2024", "Fall 2024", "Fall 2025", "Spring 2026")
+STATUSES = ("Accepted on 1 Mar", "Rejected on 12 Feb", "Interview on 4 Jan",
+            "Wait listed on 9 Apr")
+ORIGINS = ("American", "International", "Other")
+MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December")
+
+# Named sizes for the benchmark runner.
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def generate_rows(count, seed=0):
+    """
+    Yields `count` synthetic applicant rows (JSON dicts).
+
+    Args:
+        count (int): Number of rows.
+        seed (int): Random seed; the same seed gives the same rows.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        university = rng.choice(UNIVERSITIES)
+        program = rng.choice(PROGRAMS)
+        row = {
+            "program": f"{program}, {university}",
+            "comments": "" if rng.random() < 0.6 else "Synthetic comment " * rng.randint(1, 8),
+            "date_added": f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2023, 2025)}",
+            "url": f"https://www.thegradcafe.com/result/{1_000_000 + i}",
+            "status": rng.choice(STATUSES),
+            "term": rng.choice(TERMS),
+            "US/International": rng.choice(ORIGINS),
+            "Degree": rng.choice(DEGREES),
+            "llm-generated-program": program,
+            "llm-generated-university": university,
+        }
+        # Scores are optional in the real data; leave some out.
+        if rng.random() < 0.8:
+            row["GPA"] = f"{rng.uniform(2.5, 4.0):.2f}"
+        if rng.random() < 0.3:
+            row["GRE"] = str(rng.randint(290, 340))
+            row["GRE V"] = str(rng.randint(140, 170))
+            row["GRE AW"] = f"{rng.randint(6, 12) / 2:.1f}"
+        yield row
+
+
+def ensure_dataset(data_dir, count, seed=0):
+    """
+    Returns the path of a synthetic JSONL file, writing it if missing.
+
+    Files are named by size and seed, so repeated benchmark runs reuse them.
+
+    Args:
+        data_dir (str): Directory holding the generated files.
+        count (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        str: Path to the JSONL file.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"applicants_{count}_seed{seed}.jsonl")
+    if not os.path.exists(path):
+        line_index.write_jsonl(path, generate_rows(count, seed))
+    return path
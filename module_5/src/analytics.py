@@ -0,0 +1,290 @@
+"""
+Offline, vectorized analytics over a columnar snapshot of applicant data.
+
+Loads the applicant JSON Lines file (or rows exported from the `applicants`
+table) into NumPy columns and computes the same metrics dictionary as
+`query_data._fetch_metrics` with boolean masks, so ad-hoc analyses run in
+milliseconds without a PostgreSQL server. SQL semantics are kept: NULLs never
+match `=`, `LIKE` or `NOT IN`, and averages skip NULLs (None when empty).
+"""
+import argparse
+import os
+import re
+import numpy as np
+import psycopg
+from psycopg import sql
+from .query_data import _print_metrics
+from .record import APPLICANT_COLUMNS
+from .utils import iter_records
+
+NUMERIC_COLUMNS = ('gpa', 'gre', 'gre_v', 'gre_aw')
+CATEGORICAL_COLUMNS = (
+    'term', 'status', 'us_or_international', 'degree',
+    'llm_generated_university', 'llm_generated_program'
+)
+
+
+def _to_float(value):
+    """Parses a score leniently; missing or unparsable values become NaN."""
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _encode(values):
+    """
+    Dictionary-encodes a column of strings.
+
+    Args:
+        values: Iterable of strings or None.
+
+    Returns:
+        Tuple of (int32 codes with -1 for NULL, list of distinct labels)
+    """
+    lookup = {}
+    codes = np.fromiter(
+        (-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values),
+        dtype=np.int32,
+    )
+    return codes, list(lookup)
+
+
+def _like_regex(pattern):
+    """Translates a SQL LIKE pattern (% and _ wildcards) to a regex."""
+    parts = []
+    for char in pattern:
+        if char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+class ApplicantColumns:
+    """
+    Columnar snapshot of the applicants table.
+
+    Numeric scores are float64 arrays with NaN for NULL; categorical columns
+    are int32 code arrays (-1 for NULL) plus their label lists, so filters are
+    evaluated once per distinct label and then broadcast over the codes.
+    """
+
+    def __init__(self, numeric, categorical):
+        self.numeric = numeric
+        self.categorical = categorical
+
+    def __len__(self):
+        column = next(iter(self.numeric.values()), None)
+        return 0 if column is None else len(column)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds the columns from record tuples in `APPLICANT_COLUMNS` order.
+
+        Args:
+            records: Iterable of tuples, e.g. from `create_record_from_json`
+                or `SELECT <APPLICANT_COLUMNS> FROM applicants`.
+
+        Returns:
+            ApplicantColumns instance
+        """
+        rows = list(records)
+        index = {name: i for i, name in enumerate(APPLICANT_COLUMNS)}
+        numeric = {
+            name: np.fromiter(
+                (_to_float(r[index[name]]) for r in rows),
+                dtype=np.float64, count=len(rows),
+            )
+            for name in NUMERIC_COLUMNS
+        }
+        categorical = {
+            name: _encode(r[index[name]] for r in rows)
+            for name in CATEGORICAL_COLUMNS
+        }
+        return cls(numeric, categorical)
+
+    @classmethod
+    def from_jsonl(cls, jsonl_file_path):
+        """
+        Loads an applicant JSON Lines file, skipping malformed lines.
+
+        Args:
+            jsonl_file_path: Path to the JSON Lines file.
+
+        Returns:
+            ApplicantColumns instance
+        """
+        return cls.from_records(iter_records(jsonl_file_path))
+
+    @classmethod
+    def from_db(cls, cur):
+        """
+        Snapshots the `applicants` table with one SELECT.
+
+        Args:
+            cur: Database cursor
+
+        Returns:
+            ApplicantColumns instance
+        """
+        query = sql.SQL("SELECT {fields} FROM {table}").format(
+            fields=sql.SQL(', ').join(map(sql.Identifier, APPLICANT_COLUMNS)),
+            table=sql.Identifier('applicants')
+        )
+        cur.execute(query)
+        return cls.from_records(cur.fetchall())
+
+    def _label_mask(self, column, predicate):
+        """Row mask for rows whose (non-NULL) label satisfies `predicate`."""
+        codes, labels = self.categorical[column]
+        keep = np.fromiter(
+            (bool(predicate(label)) for label in labels),
+            dtype=bool, count=len(labels),
+        )
+        # Append False so code -1 (NULL) indexes it and never matches.
+        return np.append(keep, False)[codes]
+
+    def equals(self, column, value):
+        """Mask for `column = value`."""
+        return self._label_mask(column, lambda label: label == value)
+
+    def not_in(self, column, values):
+        """Mask for `column NOT IN (values)`; NULL rows do not match."""
+        excluded = set(values)
+        return self._label_mask(column, lambda label: label not in excluded)
+
+    def like(self, column, pattern):
+        """Mask for `column LIKE pattern`."""
+        regex = _like_regex(pattern)
+        return self._label_mask(column, regex.fullmatch)
+
+    def not_null(self, column):
+        """Mask for `column IS NOT NULL` on a numeric column."""
+        return ~np.isnan(self.numeric[column])
+
+    def mean(self, column, mask=None):
+        """
+        SQL-style AVG of a numeric column over the rows in `mask`.
+
+        Returns:
+            Float average, or None when no non-NULL values are selected
+        """
+        values = self.numeric[column]
+        if mask is not None:
+            values = values[mask]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if values.size else None
+
+
+def _all(*masks):
+    """Logical AND of several row masks."""
+    return np.logical_and.reduce(masks)
+
+
+def _percent(part, whole):
+    """Percentage of `part` in `whole`, 0 when `whole` is empty."""
+    return (part / whole) * 100 if whole > 0 else 0
+
+
+def compute_metrics(cols):
+    """
+    Computes the `query_data._fetch_metrics` dictionary from columns.
+
+    Args:
+        cols: ApplicantColumns instance
+
+    Returns:
+        Dictionary with the same keys and value semantics as the SQL version
+    """
+    metrics = {}
+    metrics['total_count'] = len(cols)
+    metrics['international_count'] = int(
+        cols.equals('us_or_international', 'International').sum()
+    )
+    metrics['us_count'] = int(
+        cols.equals('us_or_international', 'American').sum()
+    )
+    metrics['other_count'] = int(
+        cols.not_in('us_or_international', ['International', 'American']).sum()
+    )
+    metrics['percent_international'] = _percent(
+        metrics['international_count'], metrics['total_count']
+    )
+
+    all_scores = _all(*(cols.not_null(c) for c in NUMERIC_COLUMNS))
+    metrics['avg_metrics'] = tuple(
+        cols.mean(c, all_scores) for c in NUMERIC_COLUMNS
+    )
+
+    fall_2025 = cols.equals('term', 'Fall 2025')
+    accepted = _all(fall_2025, cols.like('status', 'Accepted%'))
+    metrics['avg_gpa_american'] = cols.mean(
+        'gpa', _all(cols.equals('us_or_international', 'American'), fall_2025)
+    )
+    metrics['acceptance_count'] = int(accepted.sum())
+    metrics['fall_2025_total_count'] = int(fall_2025.sum())
+    metrics['acceptance_percent'] = _percent(
+        metrics['acceptance_count'], metrics['fall_2025_total_count']
+    )
+    metrics['avg_gpa_accepted'] = cols.mean('gpa', accepted)
+
+    def count(university, degree, program, term_pattern=None):
+        mask = _all(
+            cols.equals('llm_generated_university', university),
+            cols.equals('degree', degree),
+            cols.equals('llm_generated_program', program),
+        )
+        if term_pattern is not None:
+            mask &= cols.like('term', term_pattern)
+        return int(mask.sum())
+
+    metrics['jhu_masters_cs_count'] = count(
+        'Johns Hopkins University', 'Masters', 'Computer Science'
+    )
+    metrics['gtu_phd_25'] = count(
+        'Georgetown University', 'PhD', 'Computer Science', '%2025'
+    )
+    metrics['uc_cs_23'] = count(
+        'University of Chicago', 'Masters', 'Computer Science', '%2023'
+    )
+    metrics['bu_phd'] = cols.mean(
+        'gpa',
+        _all(
+            cols.equals('llm_generated_university', 'Boston University'),
+            cols.equals('degree', 'PhD'),
+        ),
+    )
+    return metrics
+
+
+def main():
+    """Prints the metrics for a JSON Lines file or a database snapshot."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        'jsonl_file', nargs='?', default='module_3/applicant_data.json.jsonl',
+        help='Applicant JSON Lines file to analyze.'
+    )
+    parser.add_argument(
+        '--db', action='store_true',
+        help='Snapshot the applicants table from DATABASE_URL instead.'
+    )
+    args = parser.parse_args()
+
+    if args.db:
+        with psycopg.connect(os.environ['DATABASE_URL']) as conn:
+            with conn.cursor() as cur:
+                cols = ApplicantColumns.from_db(cur)
+    else:
+        cols = ApplicantColumns.from_jsonl(args.jsonl_file)
+
+    _print_metrics(compute_metrics(cols))
+
+
+if __name__ == "__main__":
+    main()
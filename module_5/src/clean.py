@@ -3,6 +3,13 @@ This module provides a function for cleaning and extracting data
 from a BeautifulSoup object.
 """
 import re
+from . import tracing
+from .record import ApplicantRecord
+
+GPA_RE = re.compile(r"GPA\s+([\d.]+)", re.I)
+GRE_RE = re.compile(r"GRE\s+(\d+)$", re.I)
+GRE_V_RE = re.compile(r"GRE V\s+(\d+)", re.I)
+GRE_AW_RE = re.compile(r"GRE AW\s+(\d+)", re.I)
 
 
 def _extract_university_info(uni_row):
@@ -17,29 +24,26 @@ def _extract_university_info(uni_row):
     return None
 
 
-def _extract_program_info(uni_row, university):
+def _extract_program_info(uni_row, university, record):
     """
-    Extracts program and degree information.
+    Extracts program and degree information into the record.
     """
-    entry = {}
     prog_div = uni_row.find_next("td", class_="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500")
     if prog_div:
         spans = prog_div.find_all("span")
         if spans:
-            entry["program"] = f"{spans[0].get_text(strip=True)}, {university}"
+            record.program = f"{spans[0].get_text(strip=True)}, {university}"
         if len(spans) > 1:
-            entry["Degree"] = spans[1].get_text(strip=True)
-    return entry
+            record.degree = spans[1].get_text(strip=True)
 
 
-def _extract_status_and_date(uni_row):
+def _extract_status_and_date(uni_row, record):
     """
-    Extracts application status and date added.
+    Extracts application status and date added into the record.
     """
-    entry = {}
     date_td = uni_row.find("td", class_=re.compile("tw-whitespace-nowrap"))
     if date_td:
-        entry["date_added"] = date_td.get_text(strip=True)
+        record.date_added = date_td.get_text(strip=True)
 
     status_div = uni_row.find("div", class_=re.compile("tw-inline-flex.*tw-font-medium"))
     if status_div:
@@ -49,40 +53,36 @@ def _extract_status_and_date(uni_row):
             status_text,
         )
         if match:
-            entry["status"] = match.group(1)
-    return entry
+            record.status = match.group(1)
 
 
-def _extract_gre_and_gpa(tag):
+def _extract_gre_and_gpa(tag, record):
     """
-    Extracts GRE and GPA scores from a tag.
+    Extracts GRE and GPA scores from a tag into the record.
     """
-    entry = {}
-    gpa_match = re.search(r"GPA\s+([\d.]+)", tag, re.I)
+    gpa_match = GPA_RE.search(tag)
     if gpa_match:
-        entry["GPA"] = gpa_match.group(1)
+        record.gpa = gpa_match.group(1)
 
-    gre_match = re.search(r"GRE\s+(\d+)$", tag, re.I)
+    gre_match = GRE_RE.search(tag)
     if gre_match:
-        entry["GRE"] = gre_match.group(1)
+        record.gre = gre_match.group(1)
 
-    gre_v_match = re.search(r"GRE V\s+(\d+)", tag, re.I)
+    gre_v_match = GRE_V_RE.search(tag)
     if gre_v_match:
-        entry["GRE V"] = gre_v_match.group(1)
+        record.gre_v = gre_v_match.group(1)
 
-    gre_aw_match = re.search(r"GRE AW\s+(\d+)", tag, re.I)
+    gre_aw_match = GRE_AW_RE.search(tag)
     if gre_aw_match:
-        entry["GRE AW"] = gre_aw_match.group(1)
-    return entry
+        record.gre_aw = gre_aw_match.group(1)
 
 
-def _extract_details(detail_row):
+def _extract_details(detail_row, record):
     """
     Extracts additional details like GPA, GRE, term, and location.
     """
-    entry = {}
     if not detail_row:
-        return entry
+        return
 
     tags = detail_row.find_all("div", class_=re.compile("tw-inline-flex"))
     for tag in tags:
@@ -90,35 +90,36 @@ def _extract_details(detail_row):
 
         # Get semester for term
         if "Fall" in text or "Spring" in text:
-            entry["term"] = text
+            record.term = text
 
         # Get International / American
         if text in ["International", "American"]:
-            entry["US/International"] = text
+            record.us_or_international = text
 
-        entry.update(_extract_gre_and_gpa(text))
-    return entry
+        _extract_gre_and_gpa(text, record)
 
 
-def _extract_comments(detail_row):
+def _extract_comments(detail_row, record):
     """
-    Extracts comments from the table row sibling.
+    Extracts comments from the table row sibling into the record.
     """
-    entry = {}
     if not detail_row:
-        return entry
+        return
 
     comment_row = detail_row.find_next_sibling("tr", class_="tw-border-none")
     if comment_row:
         comment_p = comment_row.find("p", class_="tw-text-gray-500 tw-text-sm tw-my-0")
         if comment_p:
-            entry["comments"] = re.sub(r"\s+", " ", comment_p.get_text(strip=True))
-    return entry
+            record.comments = re.sub(r"\s+", " ", comment_p.get_text(strip=True))
 
 
+@tracing.traced("clean.records")
 def clean_data(soup):
     """
     Cleans and extracts information from a BeautifulSoup output.
+
+    Returns:
+        list: One ApplicantRecord per result row.
     """
     results = []
 
@@ -128,24 +129,24 @@ def clean_data(soup):
         if not university:
             continue
 
-        entry = {"url": None}
+        record = ApplicantRecord()
 
         # Get University and Program info
-        entry.update(_extract_program_info(uni_row, university))
+        _extract_program_info(uni_row, university, record)
 
         # Get date and status
-        entry.update(_extract_status_and_date(uni_row))
+        _extract_status_and_date(uni_row, record)
 
         # Get the url tag and concatenate with base url
         url_tag = uni_row.find("a", href=re.compile(r"/result/\d+"))
         if url_tag:
-            entry["url"] = f"https://www.thegradcafe.com{url_tag.get('href')}"
+            record.url = f"https://www.thegradcafe.com{url_tag.get('href')}"
 
         # Go through sibling table rows for details
         detail_row = uni_row.find_next_sibling("tr", class_="tw-border-none")
-        entry.update(_extract_details(detail_row))
-        entry.update(_extract_comments(detail_row))
+        _extract_details(detail_row, record)
+        _extract_comments(detail_row, record)
 
-        results.append(entry)
+        results.append(record)
 
     return results
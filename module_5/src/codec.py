@@ -0,0 +1,148 @@
+"""
+Pluggable JSON codec for every JSON/JSONL reader and writer in module_5.
+
+Uses orjson when it is installed, then msgspec, then the standard library.
+Set `JSON_CODEC=orjson|msgspec|stdlib` to force one. All backends accept and
+produce the same documents:
+
+- `loads` / `dumps` handle one compact JSON value (`dumps` returns str and
+  keeps non-ASCII text as-is, like `ensure_ascii=False`).
+- `dumps_pretty` always uses the standard library with `indent=4`, so
+  pretty files stay byte-identical whichever backend is active. Pass
+  `ensure_ascii=True` where a file has always been written escaped.
+- `decode_record` parses one JSONL line straight into an `ApplicantRecord`
+  (with msgspec, into a typed struct first, with no intermediate dict).
+
+Decode errors from every backend are raised as `json.JSONDecodeError`, so
+existing `except json.JSONDecodeError` handlers keep working.
+"""
+import json
+import os
+from .record import APPLICANT_COLUMNS, JSON_KEYS, ApplicantRecord
+
+# orjson and msgspec are C extensions that pylint cannot introspect.
+# pylint: disable=no-member
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+def _pick_backend():
+    """Returns the backend name from JSON_CODEC or the best one installed."""
+    wanted = os.environ.get('JSON_CODEC', '').strip().lower()
+    available = {'orjson': orjson, 'msgspec': msgspec, 'stdlib': json}
+    if wanted:
+        if available.get(wanted) is None:
+            raise ImportError(
+                f"JSON_CODEC={wanted!r} is not installed or not supported; "
+                "use orjson, msgspec or stdlib."
+            )
+        return wanted
+    if orjson is not None:
+        return 'orjson'
+    if msgspec is not None:
+        return 'msgspec'
+    return 'stdlib'
+
+
+BACKEND = _pick_backend()
+
+
+def _stdlib_loads(data):
+    """Standard library decode."""
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj):
+    """Standard library compact encode."""
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _orjson_dumps(obj):
+    """orjson encode, falling back to stdlib for values orjson rejects."""
+    try:
+        return orjson.dumps(obj).decode('utf-8')
+    except TypeError:
+        # e.g. non-str dict keys or integers wider than 64 bits
+        return _stdlib_dumps(obj)
+
+
+def _msgspec_error(data, error):
+    """Wraps a msgspec error as json.JSONDecodeError."""
+    doc = data.decode('utf-8', 'replace') if isinstance(data, bytes) else data
+    return json.JSONDecodeError(str(error), doc, 0)
+
+
+if BACKEND == 'msgspec':
+    _DECODER = msgspec.json.Decoder()
+    _ENCODER = msgspec.json.Encoder()
+    # Typed struct for one applicant row, keyed by the JSON names.
+    _RecordStruct = msgspec.defstruct(
+        'ApplicantStruct',
+        [(name, object, None) for name in APPLICANT_COLUMNS],
+        rename=dict(zip(APPLICANT_COLUMNS, JSON_KEYS)),
+    )
+    _RECORD_DECODER = msgspec.json.Decoder(_RecordStruct)
+
+    def loads(data):
+        """Decodes one JSON document (str or bytes)."""
+        try:
+            return _DECODER.decode(data)
+        except msgspec.DecodeError as e:
+            raise _msgspec_error(data, e) from e
+
+    def dumps(obj):
+        """Encodes one value as compact JSON text."""
+        try:
+            return _ENCODER.encode(obj).decode('utf-8')
+        except TypeError:
+            return _stdlib_dumps(obj)
+
+    def decode_record(line):
+        """Decodes one JSON object line into an ApplicantRecord."""
+        try:
+            struct = _RECORD_DECODER.decode(line)
+        except msgspec.DecodeError as e:
+            raise _msgspec_error(line, e) from e
+        return ApplicantRecord(
+            **{name: getattr(struct, name) for name in APPLICANT_COLUMNS}
+        )
+
+elif BACKEND == 'orjson':
+    # orjson.JSONDecodeError already subclasses json.JSONDecodeError.
+    loads = orjson.loads
+    dumps = _orjson_dumps
+
+    def decode_record(line):
+        """Decodes one JSON object line into an ApplicantRecord."""
+        return ApplicantRecord.from_dict(orjson.loads(line))
+
+else:
+    loads = _stdlib_loads
+    dumps = _stdlib_dumps
+
+    def decode_record(line):
+        """Decodes one JSON object line into an ApplicantRecord."""
+        return ApplicantRecord.from_dict(json.loads(line))
+
+
+def dumps_pretty(obj, ensure_ascii=False):
+    """
+    Encodes a value as indented JSON with the standard library (indent=4).
+
+    Args:
+        obj: The value to encode.
+        ensure_ascii (bool): Escape non-ASCII text, as `json.dump` does by
+            default. Off by default, keeping the text as-is.
+
+    Returns:
+        str: The indented JSON text.
+    """
+    return json.dumps(obj, ensure_ascii=ensure_ascii, indent=4)
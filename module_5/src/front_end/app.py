@@ -5,8 +5,13 @@ It displays various statistics and allows users to trigger a data scraping job.
 import os
 import subprocess
 import threading
-from flask import Flask, render_template, redirect, url_for, flash
+import time
+from contextlib import contextmanager
+from flask import Flask, Response, g, render_template, redirect, request, url_for, flash
+import psycopg
 import psycopg_pool
+from module_5.src.metrics import CONTENT_TYPE, Registry
+from module_5.src.query_log import LoggedCursor
 from module_5.src.sql_utils import (
     build_count_query, build_avg_query,
     build_where_equals, build_where_like,
@@ -39,6 +44,140 @@ SCRAPING_IN_PROGRESS = False
 # Add a query result limit for safety
 QUERY_LIMIT = 1000000
 
+# Operational metrics served at /metrics.
+METRICS = Registry()
+REQUEST_LATENCY = METRICS.histogram(
+    'dashboard_request_duration_seconds',
+    'Time to handle a request, by route.',
+    ['route', 'method', 'status'],
+)
+QUERY_LATENCY = METRICS.histogram(
+    'dashboard_query_duration_seconds',
+    'Time to run one dashboard query, by query.',
+    ['query'],
+)
+POOL_STATS = METRICS.gauge(
+    'dashboard_pool_stat',
+    'Connection pool statistics from pool.get_stats().',
+    ['stat'],
+)
+DB_CACHE_HIT_RATIO = METRICS.gauge(
+    'dashboard_db_cache_hit_ratio',
+    'Share of PostgreSQL block reads served from shared buffers.',
+)
+SCRAPE_IN_PROGRESS = METRICS.gauge(
+    'dashboard_scrape_in_progress',
+    '1 while a scrape job is running.',
+)
+SCRAPE_RUNNING_SECONDS = METRICS.gauge(
+    'dashboard_scrape_running_seconds',
+    'Age of the running scrape job (0 when idle).',
+)
+SCRAPE_LAST_DURATION = METRICS.gauge(
+    'dashboard_scrape_last_duration_seconds',
+    'Duration of the last finished scrape job.',
+)
+SCRAPE_LAST_FINISHED = METRICS.gauge(
+    'dashboard_scrape_last_finished_timestamp_seconds',
+    'Unix time the last scrape job finished.',
+)
+SCRAPE_RUNS = METRICS.counter(
+    'dashboard_scrape_runs_total',
+    'Finished scrape jobs, by result.',
+    ['result'],
+)
+# time.monotonic() when the running scrape started, else None.
+SCRAPE_STARTED_AT = None
+# pg_stat_database is read at most this often, however often /metrics is scraped.
+CACHE_HIT_RATIO_TTL = float(os.environ.get('CACHE_HIT_RATIO_TTL', '30'))
+cache_hit_ratio_lock = threading.Lock()
+# time.monotonic() of the last cache hit ratio read, else None.
+CACHE_HIT_RATIO_READ_AT = None
+
+
+@contextmanager
+def _timed_query(name):
+    """Records the duration of one dashboard query under `name`."""
+    with QUERY_LATENCY.time(query=name):
+        yield
+
+
+@METRICS.add_collector
+def _collect_pool_stats():
+    """Copies the pool's current statistics into gauges."""
+    for stat, value in pool.get_stats().items():
+        POOL_STATS.set(value, stat=stat)
+
+
+@METRICS.add_collector
+def _collect_cache_hit_ratio():
+    """
+    Reads the buffer cache hit ratio of the current database.
+
+    The value is refreshed at most every CACHE_HIT_RATIO_TTL seconds, so
+    scrapes do not each take a pool connection. When the read fails the
+    last value is kept until the next refresh; the other metrics are
+    served either way.
+    """
+    global CACHE_HIT_RATIO_READ_AT
+    now = time.monotonic()
+    with cache_hit_ratio_lock:
+        if (
+            CACHE_HIT_RATIO_READ_AT is not None
+            and now - CACHE_HIT_RATIO_READ_AT < CACHE_HIT_RATIO_TTL
+        ):
+            return
+        # Claimed before reading, so a failing database is retried once per TTL.
+        CACHE_HIT_RATIO_READ_AT = now
+    try:
+        with pool.connection(timeout=2.0) as conn:
+            row = conn.execute(
+                "SELECT blks_hit, blks_read FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            ).fetchone()
+    except psycopg.Error as e:
+        print(f"Could not read the cache hit ratio: {e}")
+        return
+    hits, reads = row if row else (0, 0)
+    DB_CACHE_HIT_RATIO.set(hits / (hits + reads) if hits + reads else float('nan'))
+
+
+@METRICS.add_collector
+def _collect_scrape_status():
+    """Publishes whether a scrape is running and for how long."""
+    with scrape_lock:
+        running = SCRAPING_IN_PROGRESS
+        started = SCRAPE_STARTED_AT
+    SCRAPE_IN_PROGRESS.set(1 if running else 0)
+    SCRAPE_RUNNING_SECONDS.set(
+        time.monotonic() - started if running and started is not None else 0
+    )
+
+
+@app.before_request
+def _start_request_timer():
+    """Notes when the request started."""
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _observe_request_latency(response):
+    """Records the request duration under its route template."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            route=route, method=request.method, status=response.status_code,
+        )
+    return response
+
+
+@app.route('/metrics')
+def metrics():
+    """Serves the dashboard metrics in the Prometheus text format."""
+    return Response(METRICS.render(), mimetype=CONTENT_TYPE)
+
 
 def run_scraper():
     """
@@ -48,13 +187,16 @@ def run_scraper():
     executes the 'update.py' and 'reload_data.py' scripts, and then resets
     the flag. Flash messages are used to notify the user of the outcome.
     """
-    global SCRAPING_IN_PROGRESS
+    global SCRAPING_IN_PROGRESS, SCRAPE_STARTED_AT
     with scrape_lock:
         SCRAPING_IN_PROGRESS = True
+        SCRAPE_STARTED_AT = time.monotonic()
+    result = 'failure'
     try:
         # Run the update + reload pipeline.
         subprocess.run(["python", "module_3/update.py"], check=True)
         subprocess.run(["python", "module_3/reload_data.py"], check=True)
+        result = 'success'
         print("Scraping and reloading successful.")
     except Exception as e:
         print("Scraping failed:", e)
@@ -64,7 +206,11 @@ def run_scraper():
         )
     finally:
         with scrape_lock:
+            SCRAPE_LAST_DURATION.set(time.monotonic() - SCRAPE_STARTED_AT)
+            SCRAPE_LAST_FINISHED.set(time.time())
+            SCRAPE_RUNS.inc(result=result)
             SCRAPING_IN_PROGRESS = False
+            SCRAPE_STARTED_AT = None
 
 
 @app.route("/pull", methods=["POST"])
@@ -127,39 +273,44 @@ def index():
     conn = pool.getconn()
     context = {}
     try:
-        with conn.cursor() as cur:
+        # Slow queries go to the SLOW_QUERY_LOG file.
+        with LoggedCursor(conn.cursor()) as cur:
             # Query 1: Count of all applicants.
-            query = build_count_query('applicants', limit=QUERY_LIMIT)
-            cur.execute(query)
-            total_count = cur.fetchone()[0]
+            with _timed_query('total_count'):
+                query = build_count_query('applicants', limit=QUERY_LIMIT)
+                cur.execute(query)
+                total_count = cur.fetchone()[0]
 
             # Query 2: Count of international applicants.
-            where_clause, params = build_where_equals(
-                'us_or_international', 'International'
-            )
-            query = build_count_query(
-                'applicants', where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
-            international_count = cur.fetchone()[0]
+            with _timed_query('international_count'):
+                where_clause, params = build_where_equals(
+                    'us_or_international', 'International'
+                )
+                query = build_count_query(
+                    'applicants', where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
+                international_count = cur.fetchone()[0]
 
             # Query 3: Count of American applicants.
-            where_clause, params = build_where_equals(
-                'us_or_international', 'American'
-            )
-            query = build_count_query(
-                'applicants', where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
+            with _timed_query('american_count'):
+                where_clause, params = build_where_equals(
+                    'us_or_international', 'American'
+                )
+                query = build_count_query(
+                    'applicants', where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
 
             # Query 4: Count of neither American nor international.
-            where_clause, params = build_where_not_in(
-                'us_or_international', ['International', 'American']
-            )
-            query = build_count_query(
-                'applicants', where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
+            with _timed_query('other_count'):
+                where_clause, params = build_where_not_in(
+                    'us_or_international', ['International', 'American']
+                )
+                query = build_count_query(
+                    'applicants', where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
 
             # Query 5: Percentage of international students.
             if total_count:
@@ -170,25 +321,29 @@ def index():
                 percent_international = 0
 
             # Query 6: Average GPA, GRE, GRE V, GRE AW.
-            avg_metrics = query_avg_all_metrics(cur, QUERY_LIMIT)
+            with _timed_query('avg_all_metrics'):
+                avg_metrics = query_avg_all_metrics(cur, QUERY_LIMIT)
 
             # Query 7: Average GPA of American students in Fall 2025.
-            avg_gpa_american = query_american_fall_2025_gpa(
-                cur, QUERY_LIMIT
-            )
+            with _timed_query('avg_gpa_american_fall_2025'):
+                avg_gpa_american = query_american_fall_2025_gpa(
+                    cur, QUERY_LIMIT
+                )
 
             # Query 8: Fall 2025 total count
-            where_clause, params = build_where_equals('term', 'Fall 2025')
-            query = build_count_query(
-                'applicants', where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
-            fall_2025_total_count = cur.fetchone()[0]
+            with _timed_query('fall_2025_count'):
+                where_clause, params = build_where_equals('term', 'Fall 2025')
+                query = build_count_query(
+                    'applicants', where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
+                fall_2025_total_count = cur.fetchone()[0]
 
             # Query 9: Acceptance count for Fall 2025.
-            acceptance_count = query_fall_2025_accepted_count(
-                cur, QUERY_LIMIT
-            )
+            with _timed_query('fall_2025_accepted_count'):
+                acceptance_count = query_fall_2025_accepted_count(
+                    cur, QUERY_LIMIT
+                )
 
             if fall_2025_total_count:
                 acceptance_percent = (
@@ -198,56 +353,61 @@ def index():
                 acceptance_percent = 0
 
             # Query 10: Average GPA of accepted applicants in Fall 2025.
-            avg_gpa_accepted = query_fall_2025_accepted_gpa(
-                cur, QUERY_LIMIT
-            )
+            with _timed_query('avg_gpa_accepted_fall_2025'):
+                avg_gpa_accepted = query_fall_2025_accepted_gpa(
+                    cur, QUERY_LIMIT
+                )
 
             # Query 11: JHU Masters Computer Science count.
-            jhu_masters_cs_count = query_university_program_degree(
-                cur, 'Johns Hopkins University', 'Masters',
-                'Computer Science', QUERY_LIMIT
-            )
+            with _timed_query('jhu_masters_cs_count'):
+                jhu_masters_cs_count = query_university_program_degree(
+                    cur, 'Johns Hopkins University', 'Masters',
+                    'Computer Science', QUERY_LIMIT
+                )
 
             # Query 12: Georgetown University, PhD in CS, 2025 count.
-            gtu_phd_25 = query_university_program_degree_term(
-                cur, 'Georgetown University', 'PhD',
-                'Computer Science', '%2025', QUERY_LIMIT
-            )
+            with _timed_query('georgetown_phd_cs_2025_count'):
+                gtu_phd_25 = query_university_program_degree_term(
+                    cur, 'Georgetown University', 'PhD',
+                    'Computer Science', '%2025', QUERY_LIMIT
+                )
 
             # Query 13: UChicago Masters CS 2023 accepted count.
-            clause1, params1 = build_where_equals(
-                'llm_generated_university', 'University of Chicago'
-            )
-            clause2, params2 = build_where_equals('degree', 'Masters')
-            clause3, params3 = build_where_equals(
-                'llm_generated_program', 'Computer Science'
-            )
-            clause4, params4 = build_where_like('term', '%2023')
-            clause5, params5 = build_where_like('status', 'Accepted%')
-            where_clause, params = build_where_and([
-                (clause1, params1), (clause2, params2),
-                (clause3, params3), (clause4, params4), (clause5, params5)
-            ])
-            query = build_count_query(
-                'applicants', where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
-            uc_cs_23 = cur.fetchone()[0]
+            with _timed_query('uchicago_masters_cs_2023_accepted'):
+                clause1, params1 = build_where_equals(
+                    'llm_generated_university', 'University of Chicago'
+                )
+                clause2, params2 = build_where_equals('degree', 'Masters')
+                clause3, params3 = build_where_equals(
+                    'llm_generated_program', 'Computer Science'
+                )
+                clause4, params4 = build_where_like('term', '%2023')
+                clause5, params5 = build_where_like('status', 'Accepted%')
+                where_clause, params = build_where_and([
+                    (clause1, params1), (clause2, params2),
+                    (clause3, params3), (clause4, params4), (clause5, params5)
+                ])
+                query = build_count_query(
+                    'applicants', where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
+                uc_cs_23 = cur.fetchone()[0]
 
             # Query 14: Average admit GPA of PhD at Boston University.
-            clause1, params1 = build_where_equals(
-                'llm_generated_university', 'Boston University'
-            )
-            clause2, params2 = build_where_equals('degree', 'PhD')
-            clause3, params3 = build_where_like('status', 'Accepted%')
-            where_clause, params = build_where_and([
-                (clause1, params1), (clause2, params2), (clause3, params3)
-            ])
-            query = build_avg_query(
-                'applicants', ['gpa'], where_clause, limit=QUERY_LIMIT
-            )
-            cur.execute(query, params)
-            bu_phd = cur.fetchone()[0]
+            with _timed_query('bu_phd_accepted_avg_gpa'):
+                clause1, params1 = build_where_equals(
+                    'llm_generated_university', 'Boston University'
+                )
+                clause2, params2 = build_where_equals('degree', 'PhD')
+                clause3, params3 = build_where_like('status', 'Accepted%')
+                where_clause, params = build_where_and([
+                    (clause1, params1), (clause2, params2), (clause3, params3)
+                ])
+                query = build_avg_query(
+                    'applicants', ['gpa'], where_clause, limit=QUERY_LIMIT
+                )
+                cur.execute(query, params)
+                bu_phd = cur.fetchone()[0]
 
             # Populate the context dictionary with the fetched data.
             context = {
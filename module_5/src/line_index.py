@@ -0,0 +1,335 @@
+"""
+Memory-mapped line index for random access into applicant JSONL files.
+
+Every indexed JSONL file gets a sidecar `<file>.idx` holding:
+
+- a header (magic, the source file's size and mtime, record and URL counts),
+- the byte offset of every record (plus the end of the file), and
+- the 64-bit blake2b hash of each record's URL paired with its record
+  number, sorted by hash.
+
+`LineIndex.open` maps the sidecar and checks it against the source file's
+size and mtime. Reading record N or looking up a URL is then a seek and a
+single-line decode, with no scan of the file. The sidecar is written by
+`write_jsonl` (used by the update pipeline's JSONL writers) or rebuilt with
+`build_index`. A stale or missing index is never trusted.
+
+`open_or_build(path, persist=False)` builds the same index in memory
+without writing a sidecar, for read-only mounts and one-off reads.
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from . import codec
+
+# Native byte order is recorded in the magic; other machines just rebuild.
+MAGIC = b"JLIDX1" + (b"L" if sys.byteorder == "little" else b"B") + b"\0"
+# magic, source size, source mtime_ns, record count, url count
+HEADER = struct.Struct("=8sQQQQ")
+
+
+def index_path(jsonl_path):
+    """Returns the sidecar index path for a JSONL file."""
+    return f"{jsonl_path}.idx"
+
+
+def remove(jsonl_path):
+    """
+    Deletes a JSONL file together with its sidecar index.
+
+    Returns:
+        list: the paths that existed and were deleted
+    """
+    deleted = []
+    for path in (jsonl_path, index_path(jsonl_path)):
+        if os.path.exists(path):
+            os.remove(path)
+            deleted.append(path)
+    return deleted
+
+
+def url_hash(url):
+    """64-bit blake2b hash of a URL."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class LineIndexBuilder:
+    """Collects record offsets and URL hashes while a JSONL file is written."""
+
+    def __init__(self):
+        self.offsets = array("Q", [0])
+        self.urls = []
+
+    def add(self, nbytes, url=None):
+        """
+        Records one line of `nbytes` bytes (including its newline).
+
+        Args:
+            nbytes: Encoded length of the line.
+            url: The record's URL, if it has one.
+        """
+        if url:
+            self.urls.append((url_hash(url), len(self.offsets) - 1))
+        self.offsets.append(self.offsets[-1] + nbytes)
+
+    def skip(self, nbytes):
+        """Accounts for a line that is not a record (blank or invalid)."""
+        self.offsets[-1] += nbytes
+
+    def pack(self, jsonl_path):
+        """Returns the sidecar bytes for the (fully written) JSONL file."""
+        stat = os.stat(jsonl_path)
+        self.urls.sort()
+        hashes = array("Q", (h for h, _ in self.urls))
+        lines = array("Q", (n for _, n in self.urls))
+        offsets = array("Q", self.offsets)
+        offsets[-1] = stat.st_size
+        header = HEADER.pack(
+            MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) - 1, len(hashes)
+        )
+        return header + offsets.tobytes() + hashes.tobytes() + lines.tobytes()
+
+    def save(self, jsonl_path):
+        """Writes the sidecar for the (fully written) JSONL file atomically."""
+        data = self.pack(jsonl_path)
+        path = index_path(jsonl_path)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def write_jsonl(filepath, rows):
+    """
+    Writes dictionaries as JSONL and builds the sidecar index alongside.
+
+    Rows go to `<filepath>.tmp`, which then replaces `filepath`, so `rows`
+    may be a generator that is still reading the old `filepath`.
+
+    Args:
+        filepath (str): Path to the output JSONL file.
+        rows (iterable): Dictionaries to write, one per line.
+
+    Returns:
+        int: Number of rows written.
+    """
+    builder = LineIndexBuilder()
+    tmp = f"{filepath}.tmp"
+    with open(tmp, "wb") as f:
+        for row in rows:
+            line = codec.dumps(row).encode("utf-8") + b"\n"
+            f.write(line)
+            builder.add(len(line), row.get("url"))
+    os.replace(tmp, filepath)
+    builder.save(filepath)
+    return len(builder.offsets) - 1
+
+
+def _decode_record(line):
+    """Returns the JSON object on a line, or None if it is blank or invalid."""
+    stripped = line.strip()
+    try:
+        obj = codec.loads(stripped) if stripped else None
+    except ValueError:
+        obj = None
+    return obj if isinstance(obj, dict) else None
+
+
+def _scan(jsonl_path):
+    """Returns a builder holding the index of an existing JSONL file."""
+    builder = LineIndexBuilder()
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            obj = _decode_record(line)
+            if obj is not None:
+                builder.add(len(line), obj.get("url"))
+            else:
+                builder.skip(len(line))
+    return builder
+
+
+def build_index(jsonl_path):
+    """
+    Scans an existing JSONL file and writes its sidecar index.
+
+    Lines that are blank or not valid JSON objects are kept out of the
+    index; their bytes trail the previous record's span, and readers only
+    decode the first line of a span.
+
+    Args:
+        jsonl_path (str): Path to the JSONL file.
+    """
+    _scan(jsonl_path).save(jsonl_path)
+
+
+class LineIndex:
+    """
+    Read-only view of a JSONL file through its memory-mapped sidecar.
+
+    Use `LineIndex.open(path)`; it returns None when there is no index or
+    it does not match the file. Close it (or use `with`) when done.
+
+    `mapped` is the sidecar's mmap, or the packed bytes of an in-memory
+    index (with `index_file` None).
+    """
+
+    def __init__(self, jsonl_path, index_file, mapped, counts):
+        self.jsonl_path = jsonl_path
+        self._index_file = index_file
+        self._mm = mapped
+        count, n_urls = counts
+        view = memoryview(mapped)
+        start = HEADER.size
+        self._offsets = view[start:start + 8 * (count + 1)].cast("Q")
+        start += 8 * (count + 1)
+        self._hashes = view[start:start + 8 * n_urls].cast("Q")
+        start += 8 * n_urls
+        self._lines = view[start:start + 8 * n_urls].cast("Q")
+        self._source = open(jsonl_path, "rb")  # pylint: disable=consider-using-with
+
+    @classmethod
+    def open(cls, jsonl_path):
+        """
+        Maps the sidecar index of `jsonl_path` if it is current.
+
+        Returns:
+            LineIndex, or None if the index is missing, corrupt or stale
+        """
+        try:
+            stat = os.stat(jsonl_path)
+            index_file = open(index_path(jsonl_path), "rb")  # pylint: disable=consider-using-with
+        except OSError:
+            return None
+        try:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            index_file.close()
+            return None
+        magic, size, mtime_ns, count, n_urls = HEADER.unpack_from(
+            mapped.read(HEADER.size).ljust(HEADER.size, b"\0")
+        )
+        expected = HEADER.size + 8 * (count + 1 + 2 * n_urls)
+        if (
+            magic != MAGIC or size != stat.st_size
+            or mtime_ns != stat.st_mtime_ns or len(mapped) != expected
+        ):
+            mapped.close()
+            index_file.close()
+            return None
+        return cls(jsonl_path, index_file, mapped, (count, n_urls))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the mapping and open files."""
+        for view in (self._offsets, self._hashes, self._lines):
+            view.release()
+        if self._index_file is not None:
+            self._mm.close()
+            self._index_file.close()
+        self._source.close()
+
+    def read_line(self, number):
+        """Returns the raw bytes of record `number` (0 = first line)."""
+        if not 0 <= number < len(self):
+            raise IndexError(number)
+        start = self._offsets[number]
+        self._source.seek(start)
+        span = self._source.read(self._offsets[number + 1] - start)
+        return span.split(b"\n", 1)[0].strip()
+
+    def get(self, number):
+        """Decodes record `number` (negative numbers count from the end)."""
+        if number < 0:
+            number += len(self)
+        return codec.loads(self.read_line(number))
+
+    def find_url(self, url):
+        """
+        Returns the record number whose `url` equals `url`, or None.
+
+        Hash matches are confirmed against the record itself.
+        """
+        wanted = url_hash(url)
+        i = bisect.bisect_left(self._hashes, wanted)
+        while i < len(self._hashes) and self._hashes[i] == wanted:
+            number = self._lines[i]
+            if self.get(number).get("url") == url:
+                return number
+            i += 1
+        return None
+
+    def iter_reverse(self, decode=codec.loads):
+        """
+        Yields records from the last line to the first.
+
+        Args:
+            decode: Called on each raw line; defaults to `codec.loads`.
+        """
+        for number in range(len(self) - 1, -1, -1):
+            yield decode(self.read_line(number))
+
+
+def open_or_build(jsonl_path, persist=True):
+    """
+    Opens the index of `jsonl_path`, (re)building it first if needed.
+
+    A rebuilt index is saved as the sidecar when `persist` is set and the
+    directory is writable; otherwise it is kept in memory only.
+
+    Raises:
+        FileNotFoundError: if `jsonl_path` does not exist
+    """
+    index = LineIndex.open(jsonl_path)
+    if index is not None:
+        return index
+    builder = _scan(jsonl_path)
+    if persist:
+        try:
+            builder.save(jsonl_path)
+        except OSError:
+            pass  # e.g. a read-only mount: fall through to the in-memory index
+        else:
+            index = LineIndex.open(jsonl_path)
+            if index is not None:
+                return index
+    data = builder.pack(jsonl_path)
+    _, _, _, count, n_urls = HEADER.unpack_from(data)
+    return LineIndex(jsonl_path, None, data, (count, n_urls))
+
+
+def first_record(jsonl_path):
+    """
+    Returns the first record of a JSONL file without reading the rest.
+
+    Uses the sidecar index when it is current; otherwise reads only up to
+    the first line holding a JSON object, skipping blank and malformed
+    lines as the index does.
+
+    Returns:
+        dict, or None if the file is missing or has no records
+    """
+    index = LineIndex.open(jsonl_path)
+    if index is not None:
+        with index:
+            return index.get(0) if len(index) else None
+    if not os.path.exists(jsonl_path):
+        return None
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            obj = _decode_record(line)
+            if obj is not None:
+                return obj
+    return None
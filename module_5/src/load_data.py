@@ -12,81 +12,116 @@ database connection and a valid path to a `.jsonl` file containing applicant
 information.
 """
 import os
-import json
 import psycopg_pool
-from .utils import create_record_from_json
+from psycopg import sql
+from . import tracing
+from .record import APPLICANT_COLUMNS
+from .parallel_jsonl import iter_records_parallel
 
-def load_applicant_data(database_url: str, jsonl_file_path: str):
+TABLE_NAME = "applicants"
+
+
+def _create_table(cur):
+    """
+    Drops and recreates the applicants table.
+
+    Args:
+        cur: Database cursor
+    """
+    # Drop table to create a new one in the next step
+    cur.execute(f"DROP TABLE IF EXISTS {TABLE_NAME};")
+
+    # Create applicants table
+    cur.execute(f"""
+        CREATE TABLE {TABLE_NAME}(
+            p_id int GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            program TEXT,
+            comments TEXT,
+            date_added date,
+            url TEXT,
+            status TEXT,
+            term TEXT,
+            us_or_international TEXT,
+            gpa float,
+            gre float,
+            gre_v float,
+            gre_aw float,
+            degree TEXT,
+            llm_generated_program TEXT,
+            llm_generated_university TEXT
+        );""")
+
+
+def _copy_records(cur, records):
+    """
+    Streams record tuples into the applicants table with COPY.
+
+    Args:
+        cur: Database cursor
+        records: Iterable of tuples in `APPLICANT_COLUMNS` order
+
+    Returns:
+        Number of rows copied
+    """
+    query = sql.SQL("COPY {table} ({fields}) FROM STDIN").format(
+        table=sql.Identifier(TABLE_NAME),
+        fields=sql.SQL(', ').join(map(sql.Identifier, APPLICANT_COLUMNS))
+    )
+    count = 0
+    # Time spent producing records (parsing) is traced apart from COPY.
+    with tracing.span("db.copy"), cur.copy(query) as copy:
+        for record in tracing.timed_iter("load.build_records", records):
+            copy.write_row(record)
+            count += 1
+    tracing.count("db.rows_copied", count)
+    return count
+
+
+def _is_parquet(path):
+    """True for a .parquet file or a directory (a partitioned dataset)."""
+    return path.endswith('.parquet') or os.path.isdir(path)
+
+
+def load_applicant_data(database_url: str, jsonl_file_path: str, workers=None):
     """
     Loads applicant data from a JSON Lines file into a PostgreSQL database.
 
+    A `.parquet` file or a directory written by `parquet_io.export_parquet`
+    is read with pyarrow instead; either way rows are loaded with COPY.
+    Large JSON Lines files are parsed in parallel by `parallel_jsonl`
+    (small ones and single-CPU hosts stay serial), and the records still
+    reach COPY in file order.
+
     Args:
         database_url: The connection string for the PostgreSQL database.
-        jsonl_file_path: The path to the JSON Lines file containing applicant data.
+        jsonl_file_path: The path to the JSON Lines (or Parquet) file
+            containing applicant data.
+        workers: Parser processes for JSON Lines input; defaults to the
+            CPU count, and 1 parses in this process.
     """
-    # This is a constant, so the uppercase name is correct.
-    # pylint: disable=C0103
-    TABLE_NAME = "applicants"
+    if _is_parquet(jsonl_file_path):
+        # Imported lazily so JSONL loads never need pyarrow.
+        # pylint: disable=import-outside-toplevel
+        from .parquet_io import read_parquet_records
+        records = read_parquet_records(jsonl_file_path)
+    else:
+        # Streamed: chunks are decoded by worker processes while COPY
+        # consumes the records in order.
+        records = iter_records_parallel(jsonl_file_path, workers)
 
     # Use a 'with' statement for the connection pool to ensure it's closed properly.
     with psycopg_pool.ConnectionPool(database_url, min_size=0, max_size=80) as pool:
         with pool.connection() as conn:
-            with conn.cursor() as cur:
-                # Drop table to create a new one in the next step
-                cur.execute(f"DROP TABLE IF EXISTS {TABLE_NAME};")
-
-                # Create applicants table
-                cur.execute(f"""
-                    CREATE TABLE {TABLE_NAME}(
-                        p_id int GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                        program TEXT,
-                        comments TEXT,
-                        date_added date,
-                        url TEXT,
-                        status TEXT,
-                        term TEXT,
-                        us_or_international TEXT,
-                        gpa float,
-                        gre float,
-                        gre_v float,
-                        gre_aw float,
-                        degree TEXT,
-                        llm_generated_program TEXT,
-                        llm_generated_university TEXT
-                    );""")
+            with conn.cursor() as cur, tracing.span("db.create_table"):
+                _create_table(cur)
             conn.commit()  # Commit the table creation
 
-            # Correctly read the JSON Lines file line by line to handle large files
-            # and avoid the incorrect conversion to a single JSON object.
-            data_to_insert = []
-            with open(jsonl_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Strip any trailing whitespace, including newlines.
-                    line = line.strip()
-                    if line:  # Ensure the line is not empty
-                        try:
-                            record = create_record_from_json(line)
-                            data_to_insert.append(record)
-                        except json.JSONDecodeError as e:
-                            print(f"Skipping malformed JSON line: {e}")
-
-            # Insert data in a single, efficient operation using `executemany`.
-            if data_to_insert:
-                with pool.connection() as conn:
-                    with conn.cursor() as cur:
-                        columns = [
-                            'program', 'comments', 'date_added', 'url', 'status', 'term',
-                            'us_or_international', 'gpa', 'gre', 'gre_v', 'gre_aw', 'degree',
-                            'llm_generated_program', 'llm_generated_university'
-                        ]
-                        placeholders = ', '.join(['%s'] * len(columns))
-                        insert_sql = (
-                            f"INSERT INTO {TABLE_NAME} ({', '.join(columns)}) VALUES "
-                            f"({placeholders})"
-                        )
-                        cur.executemany(insert_sql, data_to_insert)
-                    conn.commit()
-                print(f"Successfully inserted {len(data_to_insert)} records into {TABLE_NAME}.")
+            # COPY streams every row in one round trip.
+            with conn.cursor() as cur:
+                inserted = _copy_records(cur, records)
+            conn.commit()
+            if inserted:
+                print(f"Successfully inserted {inserted} records into {TABLE_NAME}.")
             else:
                 print("No records found in the JSON Lines file to insert.")
 
@@ -107,3 +142,4 @@ if __name__ == "__main__":
         raise FileNotFoundError(f"JSONL file not found at: {JSONL_FILE_PATH}")
 
     load_applicant_data(DATABASE_URL, JSONL_FILE_PATH)
+    tracing.write_report()
@@ -0,0 +1,204 @@
+"""
+Minimal Prometheus-style metrics for the Flask dashboard.
+
+Provides `Counter`, `Gauge` and `Histogram` metrics with labels, and a
+`Registry` that renders them in the Prometheus text exposition format
+(version 0.0.4), so `/metrics` can be scraped without extra dependencies.
+Collectors registered with `Registry.add_collector` run at scrape time for
+values that are read on demand (pool stats, database cache hit ratio).
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; suited to page renders and single dashboard queries.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_value(value):
+    """Formats a sample value the way Prometheus expects."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    """Escapes a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    """Renders `{a="x",b="y"}` (or nothing when there are no labels)."""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:  # pylint: disable=too-few-public-methods
+    """Shared label handling for all metric types."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        """Returns the label values tuple in `labelnames` order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """Yields (suffix, label values, extra labels, value) tuples."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    def render(self):
+        """Returns the exposition lines for this metric."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, key, extra, value in self._samples():
+            lines.append(
+                f"{self.name}{suffix}{_labels(self.labelnames, key, extra)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Adds `amount` to the counter for these labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that can be set to anything."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        """Sets the gauge for these labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels):
+        """Returns the current value for these labels, or None."""
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Records one observation."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the duration of the enclosed block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total, count))
+                for key, (counts, total, count) in self._values.items()
+            )
+        for key, (counts, total, count) in items:
+            for bound, bucket in zip(self.buckets, counts):
+                yield "_bucket", key, (("le", _format_value(bound)),), bucket
+            yield "_bucket", key, (("le", "+Inf"),), count
+            yield "_sum", key, (), total
+            yield "_count", key, (), count
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors, and renders them."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        """Adds a metric and returns it."""
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Creates and registers a Counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Creates and registers a Gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Creates and registers a Histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector):
+        """
+        Registers a callable run before every render.
+
+        Collectors update gauges from live sources; an exception in one is
+        swallowed so a failing source never breaks the whole scrape.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        """Runs the collectors and returns the full exposition text."""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:  # pylint: disable=broad-exception-caught
+                continue
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
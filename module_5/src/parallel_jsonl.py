@@ -0,0 +1,146 @@
+"""
+Parallel JSON Lines parsing for large applicant reloads.
+
+The file is split into byte ranges that end on newline boundaries
+(`chunk_ranges`). Each range is parsed into record tuples in a worker
+process, and `iter_records_parallel` yields the tuples in file order, so
+the caller (the single COPY writer in `load_data`) sees exactly what
+`utils.iter_records` would produce, only with the decoding spread across
+cores. Only a bounded window of chunks is in flight at a time, so memory
+stays proportional to `workers * chunk_bytes`, not to the file size.
+
+Workers are started with the "spawn" method, so they never inherit a forked
+copy of the caller's connection pool or threads. Starting them costs more
+than parsing a small file, so files under `MIN_PARALLEL_BYTES`, or machines
+with a single usable CPU, are parsed serially.
+"""
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .utils import create_record_from_json, iter_records
+
+# Bytes per chunk handed to a worker.
+CHUNK_BYTES = int(os.environ.get("LOAD_CHUNK_BYTES", str(4 << 20)))
+# Smaller files are parsed serially.
+MIN_PARALLEL_BYTES = int(os.environ.get("LOAD_PARALLEL_MIN_BYTES", str(32 << 20)))
+
+
+def _available_cpus():
+    """CPUs this process may run on (respects affinity masks where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Splits a file into (start, end) byte ranges that end after a newline.
+
+    Args:
+        path (str): Path to the JSON Lines file.
+        chunk_bytes (int): Target size of each range.
+
+    Returns:
+        list: (start, end) offsets covering the whole file in order.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end < size:
+                # Extend to the end of the line holding byte end - 1.
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _parse_range(task):
+    """
+    Parses one byte range into record tuples (runs in a worker process).
+
+    Args:
+        task: (path, start, end) tuple.
+
+    Returns:
+        list: Record tuples in file order; malformed lines are skipped.
+    """
+    path, start, end = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    records = []
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if line:
+            try:
+                records.append(create_record_from_json(line))
+            except json.JSONDecodeError as e:
+                print(f"Skipping malformed JSON line: {e}")
+    return records
+
+
+def _ordered_chunks(path, ranges, workers):
+    """Yields parsed chunks in order, keeping at most 2 * workers pending."""
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pending = deque()
+        tasks = iter(ranges)
+        for start, end in tasks:
+            pending.append(executor.submit(_parse_range, (path, start, end)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            records = pending.popleft().result()
+            for start, end in tasks:
+                pending.append(executor.submit(_parse_range, (path, start, end)))
+                break
+            yield records
+
+
+def _flatten(chunks):
+    """Yields every record of every chunk."""
+    for records in chunks:
+        yield from records
+
+
+def iter_records_parallel(
+    jsonl_file_path, workers=None, chunk_bytes=CHUNK_BYTES,
+    min_bytes=MIN_PARALLEL_BYTES,
+):
+    """
+    Streams record tuples from a JSON Lines file, parsing chunks in parallel.
+
+    Falls back to `utils.iter_records` when there is one worker or one
+    usable CPU, or when the file is smaller than `min_bytes` or fits in a
+    single chunk, since starting processes would only add cost.
+
+    Args:
+        jsonl_file_path (str): Path to the JSON Lines file.
+        workers (int, optional): Worker processes; defaults to the CPU
+            count, and is capped at it.
+        chunk_bytes (int): Target bytes per chunk.
+        min_bytes (int): Files smaller than this are parsed serially.
+
+    Returns:
+        Generator of record tuples in `APPLICANT_COLUMNS` order, in file order
+    """
+    cpus = _available_cpus()
+    workers = min(workers or cpus, cpus)
+    if os.path.getsize(jsonl_file_path) < min_bytes:
+        workers = 1
+    # Computed eagerly so a missing file fails at the call site.
+    ranges = chunk_ranges(jsonl_file_path, chunk_bytes) if workers > 1 else []
+    if len(ranges) <= 1:
+        return iter_records(jsonl_file_path)
+    return _flatten(
+        _ordered_chunks(jsonl_file_path, ranges, min(workers, len(ranges)))
+    )
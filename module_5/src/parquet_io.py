@@ -0,0 +1,206 @@
+"""
+Parquet export/import for the applicant dataset.
+
+`export_parquet` snapshots the `applicants` table into a Parquet dataset
+partitioned by term year (`term_year=2025/...`), with dictionary-encoded
+string columns and zstd compression. `read_parquet_records` turns such a
+dataset (or a single .parquet file) back into record tuples in
+`APPLICANT_COLUMNS` order, which `load_data.load_applicant_data` streams into
+the table with COPY.
+
+pyarrow is optional; the functions here raise an ImportError that says how to
+install it when it is missing.
+"""
+import argparse
+import os
+import re
+import shutil
+import psycopg
+from psycopg import sql
+from .record import APPLICANT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pq = None
+
+PARTITION_COLUMN = 'term_year'
+TERM_YEAR_RE = re.compile(r"\b(\d{4})\b")
+# Text columns with few distinct values, stored dictionary-encoded.
+DICTIONARY_COLUMNS = [
+    'program', 'status', 'term', 'us_or_international', 'degree',
+    'llm_generated_program', 'llm_generated_university'
+]
+# Rows per record batch when exporting and reading back.
+BATCH_SIZE = 65536
+
+
+def _require_pyarrow():
+    """Raises a helpful ImportError when pyarrow is not installed."""
+    if pa is None:
+        raise ImportError(
+            "Parquet support requires pyarrow; install it with "
+            "`pip install pyarrow`."
+        )
+
+
+def _schema():
+    """Arrow schema matching the applicants table, plus p_id for ordering."""
+    text = pa.string()
+    score = pa.float64()
+    types = {
+        'date_added': pa.date32(),
+        'gpa': score, 'gre': score, 'gre_v': score, 'gre_aw': score,
+    }
+    return pa.schema(
+        [('p_id', pa.int64())]
+        + [(name, types.get(name, text)) for name in APPLICANT_COLUMNS]
+    )
+
+
+def _term_year(term):
+    """Extracts the year from a term like 'Fall 2025' (None if absent)."""
+    match = TERM_YEAR_RE.search(term or '')
+    return int(match.group(1)) if match else None
+
+
+def records_to_table(rows):
+    """
+    Builds an Arrow table from `p_id` + `APPLICANT_COLUMNS` tuples.
+
+    Args:
+        rows: Sequence of tuples as selected by `export_parquet`.
+
+    Returns:
+        pyarrow.Table with an extra `term_year` partition column
+    """
+    _require_pyarrow()
+    names = ['p_id', *APPLICANT_COLUMNS]
+    columns = {name: [r[i] for r in rows] for i, name in enumerate(names)}
+    table = pa.Table.from_pydict(columns, schema=_schema())
+    years = pa.array([_term_year(t) for t in columns['term']], type=pa.int16())
+    return table.append_column(PARTITION_COLUMN, years)
+
+
+def _chunks(rows, size):
+    """Yields lists of up to `size` rows from any iterable."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_parquet(rows, out_dir, batch_size=BATCH_SIZE):
+    """
+    Writes rows as a Parquet dataset partitioned by term year.
+
+    Partitions left by a previous export are removed first, so the dataset
+    is always a full snapshot. Rows are consumed `batch_size` at a time and
+    each batch is written as its own file per partition, so only one batch
+    is held in memory.
+
+    Args:
+        rows: Iterable of `p_id` + `APPLICANT_COLUMNS` tuples.
+        out_dir: Dataset root directory.
+        batch_size: Rows per written record batch.
+
+    Returns:
+        Number of rows written
+    """
+    _require_pyarrow()
+    if os.path.isdir(out_dir):
+        for entry in os.listdir(out_dir):
+            if entry.startswith(f"{PARTITION_COLUMN}="):
+                shutil.rmtree(os.path.join(out_dir, entry))
+    count = 0
+    for number, chunk in enumerate(_chunks(rows, batch_size)):
+        pq.write_to_dataset(
+            records_to_table(chunk),
+            root_path=out_dir,
+            partition_cols=[PARTITION_COLUMN],
+            basename_template=f"part-{number}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            use_dictionary=DICTIONARY_COLUMNS,
+            compression='zstd',
+        )
+        count += len(chunk)
+    return count
+
+
+def export_parquet(database_url, out_dir):
+    """
+    Exports the applicants table to a partitioned Parquet dataset.
+
+    The table is read through a server-side cursor and written in record
+    batches of `BATCH_SIZE` rows, so it is never loaded whole.
+
+    Args:
+        database_url: The connection string for the PostgreSQL database.
+        out_dir: Dataset root directory.
+
+    Returns:
+        Number of rows exported
+    """
+    _require_pyarrow()
+    query = sql.SQL("SELECT {fields} FROM {table} ORDER BY p_id").format(
+        fields=sql.SQL(', ').join(
+            map(sql.Identifier, ['p_id', *APPLICANT_COLUMNS])
+        ),
+        table=sql.Identifier('applicants')
+    )
+    with psycopg.connect(database_url) as conn:
+        with conn.cursor(name='parquet_export') as cur:
+            cur.itersize = BATCH_SIZE
+            cur.execute(query)
+            return write_parquet(cur, out_dir)
+
+
+def read_parquet_records(path):
+    """
+    Reads a Parquet file or dataset back into record tuples.
+
+    The data is read eagerly (so a missing pyarrow or a bad path fails before
+    any table is touched) and returned as a lazy iterator over record
+    batches, in the original `p_id` order when that column is present.
+
+    Args:
+        path: A .parquet file or a dataset directory from `export_parquet`.
+
+    Returns:
+        Iterator of tuples in `APPLICANT_COLUMNS` order
+    """
+    _require_pyarrow()
+    table = pq.read_table(path)
+    if 'p_id' in table.column_names:
+        table = table.select(['p_id', *APPLICANT_COLUMNS]).sort_by('p_id')
+    table = table.select(list(APPLICANT_COLUMNS))
+
+    def records():
+        for batch in table.to_batches(max_chunksize=BATCH_SIZE):
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    return records()
+
+
+def main():
+    """Exports the table at DATABASE_URL to the directory given on the CLI."""
+    parser = argparse.ArgumentParser(description="Export applicants to Parquet.")
+    parser.add_argument('out_dir', help='Dataset root directory.')
+    args = parser.parse_args()
+
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is not set.")
+
+    count = export_parquet(database_url, args.out_dir)
+    print(f"Exported {count} records to {args.out_dir}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ directly to the console.
 import os
 import psycopg_pool
 from psycopg import sql
+from .query_log import LoggedCursor
 from .sql_utils import (
     build_count_query, build_avg_query,
     build_where_equals, build_where_not_in
@@ -186,7 +187,8 @@ def analyze_applicant_data():
 
     with pool:
         with pool.connection() as conn:
-            with conn.cursor() as cur:
+            # Slow queries go to the SLOW_QUERY_LOG file.
+            with LoggedCursor(conn.cursor()) as cur:
                 metrics = _fetch_metrics(cur)
 
     _print_metrics(metrics)
@@ -0,0 +1,144 @@
+"""
+Slow query log for the analysis queries.
+
+`LoggedCursor` wraps a psycopg cursor and times every `execute`. Queries
+slower than `SLOW_QUERY_MS` are written to a rotating log file
+(`SLOW_QUERY_LOG`) with their rendered SQL (`sql.Composable.as_string`) and
+parameters. With `SLOW_QUERY_EXPLAIN=1` the plan from
+`EXPLAIN (ANALYZE, BUFFERS)` is captured too. Only SELECT/WITH statements
+are explained, because ANALYZE runs the statement again. The plan shows
+which `sql_utils` filters end in a sequential scan and need an index.
+
+Typical use::
+
+    with LoggedCursor(conn.cursor()) as cur:
+        metrics = _fetch_metrics(cur)
+"""
+import logging
+import os
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+import psycopg
+from psycopg import sql
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG", "slow_queries.log")
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "").lower() in (
+    "1", "true", "yes"
+)
+# Rotate at 5 MiB and keep three old files.
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+_LOGGER_LOCK = threading.Lock()
+
+
+def slow_query_logger(path=None):
+    """
+    Returns the slow query logger, attaching its rotating file on first use.
+
+    Args:
+        path: Log file; defaults to SLOW_QUERY_LOG.
+    """
+    logger = logging.getLogger("module_5.slow_queries")
+    with _LOGGER_LOCK:
+        if not logger.handlers:
+            handler = RotatingFileHandler(
+                path or SLOW_QUERY_LOG, maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUPS, encoding="utf-8", delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    return logger
+
+
+def _is_explainable(text):
+    """True for read-only statements that are safe to EXPLAIN ANALYZE."""
+    words = text.split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+class LoggedCursor:
+    """
+    Cursor wrapper that logs slow `execute` calls.
+
+    Everything other than `execute` is delegated to the wrapped cursor, so
+    it can be passed to `query_helpers` and `_fetch_metrics` unchanged.
+    """
+
+    def __init__(self, cursor, threshold_ms=None, explain=None, logger=None):
+        self._cursor = cursor
+        self.threshold_ms = SLOW_QUERY_MS if threshold_ms is None else threshold_ms
+        self.explain = SLOW_QUERY_EXPLAIN if explain is None else explain
+        self._logger = logger
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._cursor.__exit__(*exc)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, params=None, **kwargs):
+        """
+        Runs `query` on the wrapped cursor and logs it if it was slow.
+
+        Returns:
+            This wrapper, so `cur.execute(...).fetchone()` keeps working.
+        """
+        start = time.perf_counter()
+        self._cursor.execute(query, params, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= self.threshold_ms:
+            self._log_slow(query, params, elapsed_ms)
+        return self
+
+    def _render(self, query):
+        """Returns the SQL text of a string or `sql.Composable` query."""
+        if isinstance(query, sql.Composable):
+            return query.as_string(getattr(self._cursor, "connection", None))
+        if isinstance(query, bytes):
+            return query.decode("utf-8", "replace")
+        return str(query)
+
+    def _explain(self, query, params):
+        """
+        Returns the EXPLAIN (ANALYZE, BUFFERS) plan text for `query`.
+
+        Runs on a separate cursor inside a savepoint, so the caller's
+        results and transaction are left as they were.
+        """
+        conn = self._cursor.connection
+        statement = sql.SQL("EXPLAIN (ANALYZE, BUFFERS) {}").format(
+            query if isinstance(query, sql.Composable)
+            else sql.SQL(self._render(query))
+        )
+        try:
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(statement, params)
+                return "\n".join(row[0] for row in cur.fetchall())
+        except psycopg.Error as e:
+            return f"EXPLAIN failed: {e}"
+
+    def _log_slow(self, query, params, elapsed_ms):
+        """Writes one slow query entry."""
+        text = self._render(query)
+        lines = [
+            f"slow query {elapsed_ms:.1f} ms (threshold {self.threshold_ms:g} ms)",
+            f"  sql: {' '.join(text.split())}",
+            f"  params: {params!r}",
+        ]
+        if self.explain and _is_explainable(text):
+            plan = self._explain(query, params)
+            lines.append("  plan:")
+            lines.extend(f"    {line}" for line in plan.splitlines())
+        (self._logger or slow_query_logger()).info("\n".join(lines))
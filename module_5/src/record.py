@@ -0,0 +1,130 @@
+"""
+Typed, compact record for one applicant row.
+
+`ApplicantRecord` is shared by scraping (`clean.clean_data`), the update
+pipeline and loading. It uses `__slots__`, so a row costs a fixed handful of
+pointers instead of a per-row dict. It converts to and from the JSON layout
+used in our data files (keys such as 'US/International' and 'GRE V') and to
+the tuple order of the `applicants` table.
+"""
+import json
+from operator import attrgetter
+
+# Columns of the `applicants` table (minus p_id) in record tuple order.
+APPLICANT_COLUMNS = (
+    'program', 'comments', 'date_added', 'url', 'status', 'term',
+    'us_or_international', 'gpa', 'gre', 'gre_v', 'gre_aw', 'degree',
+    'llm_generated_program', 'llm_generated_university'
+)
+
+# JSON key for each field, in APPLICANT_COLUMNS order.
+JSON_KEYS = (
+    'program', 'comments', 'date_added', 'url', 'status', 'term',
+    'US/International', 'GPA', 'GRE', 'GRE V', 'GRE AW', 'Degree',
+    'llm-generated-program', 'llm-generated-university'
+)
+
+_DB_TUPLE = attrgetter(*APPLICANT_COLUMNS)
+
+
+class ApplicantRecord:  # pylint: disable=too-many-instance-attributes
+    """
+    One applicant row with a fixed set of attributes.
+
+    Attribute names match the database columns; unset fields are None.
+    """
+
+    __slots__ = APPLICANT_COLUMNS
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, *, program=None, comments=None, date_added=None, url=None,
+        status=None, term=None, us_or_international=None, gpa=None,
+        gre=None, gre_v=None, gre_aw=None, degree=None,
+        llm_generated_program=None, llm_generated_university=None
+    ):
+        self.program = program
+        self.comments = comments
+        self.date_added = date_added
+        self.url = url
+        self.status = status
+        self.term = term
+        self.us_or_international = us_or_international
+        self.gpa = gpa
+        self.gre = gre
+        self.gre_v = gre_v
+        self.gre_aw = gre_aw
+        self.degree = degree
+        self.llm_generated_program = llm_generated_program
+        self.llm_generated_university = llm_generated_university
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from a JSON-layout dictionary.
+
+        Args:
+            data: Dictionary keyed like the data files ('GRE V', ...)
+
+        Returns:
+            ApplicantRecord instance
+        """
+        get = data.get
+        return cls(
+            program=get('program'),
+            comments=get('comments'),
+            date_added=get('date_added'),
+            url=get('url'),
+            status=get('status'),
+            term=get('term'),
+            us_or_international=get('US/International'),
+            gpa=get('GPA'),
+            gre=get('GRE'),
+            gre_v=get('GRE V'),
+            gre_aw=get('GRE AW'),
+            degree=get('Degree'),
+            llm_generated_program=get('llm-generated-program'),
+            llm_generated_university=get('llm-generated-university'),
+        )
+
+    @classmethod
+    def from_json(cls, line):
+        """
+        Parses one JSON object string into a record (stdlib `json`; hot
+        paths use `codec.decode_record`, which picks the fastest backend).
+
+        Raises:
+            json.JSONDecodeError: If the line is not valid JSON
+        """
+        return cls.from_dict(json.loads(line))
+
+    def to_db_tuple(self):
+        """Returns the values in `APPLICANT_COLUMNS` (table insert) order."""
+        return _DB_TUPLE(self)
+
+    def to_json_dict(self):
+        """
+        Returns the JSON-layout dictionary for the data files.
+
+        Unset fields are omitted, except 'url', which readers index directly.
+        """
+        out = {}
+        for key, value in zip(JSON_KEYS, _DB_TUPLE(self)):
+            if value is not None or key == 'url':
+                out[key] = value
+        return out
+
+    def __eq__(self, other):
+        if not isinstance(other, ApplicantRecord):
+            return NotImplemented
+        return _DB_TUPLE(self) == other.to_db_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={value!r}"
+            for name, value in zip(APPLICANT_COLUMNS, _DB_TUPLE(self))
+            if value is not None
+        )
+        return f"ApplicantRecord({fields})"
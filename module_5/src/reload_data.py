@@ -4,8 +4,8 @@ Reads temporary JSON files produced by the scraper and LLM pipeline.
 Cleans up formatting issues and merges new rows into the database.
 """
 import os
-import json
 import psycopg_pool
+from . import line_index, tracing
 from .sql_utils import build_insert_query
 from .utils import create_record_from_json
 
@@ -22,48 +22,48 @@ JSONL_FILE_PATH = (
 )
 TABLE_NAME = 'applicants'
 
-# Empty list to populate
-DATA_TO_INSERT = []
-
-# Open and process the JSONL file
+# Index the JSONL file so it can be read back to front without loading it.
+# Built in memory: the input may sit on a read-only mount.
 try:
-    with open(JSONL_FILE_PATH, 'r', encoding='utf-8') as f:
-        for line in f:
-            record = create_record_from_json(line)
-            DATA_TO_INSERT.append(record)
+    with tracing.span("reload.index"):
+        INDEX = line_index.open_or_build(JSONL_FILE_PATH, persist=False)
 except FileNotFoundError:
     print(f"Error: The file {JSONL_FILE_PATH} was not found.")
     exit()
-except json.JSONDecodeError as e:
-    print(f"Error decoding JSON from file: {e}")
-    exit()
-
-# Re-order data for insertion
-DATA_TO_INSERT.reverse()
 
-# Insert data into the database
-if not DATA_TO_INSERT:
-    print("No records to insert. The JSONL file might be empty or invalid.")
-else:
-    columns = [
-        'program', 'comments', 'date_added', 'url', 'status', 'term',
-        'us_or_international', 'gpa', 'gre', 'gre_v', 'gre_aw', 'degree',
-        'llm_generated_program', 'llm_generated_university'
-    ]
+with INDEX:
+    # Insert data into the database
+    if len(INDEX) == 0:
+        print("No records to insert. The JSONL file might be empty or invalid.")
+    else:
+        columns = [
+            'program', 'comments', 'date_added', 'url', 'status', 'term',
+            'us_or_international', 'gpa', 'gre', 'gre_v', 'gre_aw', 'degree',
+            'llm_generated_program', 'llm_generated_university'
+        ]
 
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            # Use SQL composition for safe query building
-            insert_query = build_insert_query(TABLE_NAME, columns)
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                # Use SQL composition for safe query building
+                insert_query = build_insert_query(TABLE_NAME, columns)
 
-            # Use executemany for bulk insertion
-            cur.executemany(insert_query, DATA_TO_INSERT)
-            INSERTED_COUNT = len(DATA_TO_INSERT)
-            print(
-                f"Successfully inserted {INSERTED_COUNT} records "
-                f"into {TABLE_NAME}"
-            )
+                # Re-order data for insertion: records stream newest-last,
+                # decoded one at a time as executemany consumes them.
+                with tracing.span("db.executemany"):
+                    cur.executemany(
+                        insert_query,
+                        tracing.timed_iter(
+                            "load.build_records",
+                            INDEX.iter_reverse(decode=create_record_from_json),
+                        ),
+                    )
+                INSERTED_COUNT = len(INDEX)
+                print(
+                    f"Successfully inserted {INSERTED_COUNT} records "
+                    f"into {TABLE_NAME}"
+                )
 
 # Close the pool
 pool.close()
 print("Script finished and pool closed.")
+tracing.write_report()
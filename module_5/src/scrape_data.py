@@ -8,14 +8,15 @@ It includes functionality to:
 - Save the cleaned data to a JSON file.
 - Load the data from the JSON file for verification or further use.
 """
-import json
 import os
 from urllib import robotparser
 import urllib.error
 import urllib3
 from bs4 import BeautifulSoup
+from . import codec, tracing
 from .clean import clean_data
-from .utils import HTTP_POOL_MANAGER, DEFAULT_USER_AGENT
+from .record import ApplicantRecord
+from .utils import HTTP_POOL_MANAGER, DEFAULT_USER_AGENT, iter_json_array
 
 
 
@@ -56,20 +57,27 @@ def scrape_page(page, http_pool_manager, user_agent):
         http_pool_manager (urllib3.PoolManager): The urllib3 pool manager.
         user_agent (str): The user agent string.
     Returns:
-        list: A list of scraped data rows.
+        list: A list of scraped ApplicantRecord rows.
     """
     url = f"https://www.thegradcafe.com/survey/index.php?page={page}"
 
-    if not _robot_parser(url, user_agent):
+    with tracing.span("scrape.robots", page=page):
+        permitted = _robot_parser(url, user_agent)
+    if not permitted:
         print(f"Skipping page {page} due to robots.txt restrictions.")
         return []
 
     try:
-        response = http_pool_manager.request("GET", url)
-        soup = BeautifulSoup(response.data, "html.parser")
+        with tracing.span("scrape.fetch", page=page):
+            response = http_pool_manager.request("GET", url)
+        with tracing.span("scrape.parse_html", page=page):
+            soup = BeautifulSoup(response.data, "html.parser")
         rows = clean_data(soup)
+        tracing.count("scrape.pages")
+        tracing.count("scrape.rows", len(rows))
         return rows
     except (urllib3.exceptions.MaxRetryError, urllib.error.URLError) as e:
+        tracing.count("scrape.failed_pages")
         print(f"Failed to scrape page {page}: {e}")
         return []
 
@@ -78,15 +86,33 @@ def save_data(data, file_path):
     """
     Save cleaned data into a JSON file.
     Args:
-        data (list): The list of data to save.
+        data (list): The ApplicantRecords (or JSON dicts) to save.
         file_path (str): The path to the output JSON file.
     """
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    rows = [
+        row.to_json_dict() if isinstance(row, ApplicantRecord) else row
+        for row in data
+    ]
     with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+        # Scraped files have always been written with non-ASCII escaped.
+        f.write(codec.dumps_pretty(rows, ensure_ascii=True))
     print(f"Saved {len(data)} rows to {file_path}")
 
 
+def iter_data(filepath, where=None, fields=None):
+    """
+    Stream applicant data from a JSON file one entry at a time.
+    Args:
+        filepath (str): The path to the JSON file.
+        where (callable, optional): Keeps only entries it returns True for.
+        fields (sequence, optional): Keys to project each entry onto.
+    Returns:
+        generator: The entries, decoded as they are read.
+    """
+    return iter_json_array(filepath, where, fields)
+
+
 def load_data(filepath):
     """
     Load applicant data from a JSON file.
@@ -96,8 +122,7 @@ def load_data(filepath):
         list: The loaded data, or an empty list if the file doesn't exist.
     """
     if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = list(iter_data(filepath))
         print(f"Loaded {len(data)} entries from {filepath}")
         return data
     print(f"No existing file found at {filepath}. Starting with empty data.")
@@ -0,0 +1,211 @@
+"""
+Lightweight stage tracing for the update → LLM → reload pipeline.
+
+Wrap a stage in `with tracing.span("scrape.fetch", page=3):` (or decorate a
+function with `@tracing.traced("name")`) and bump counters with
+`tracing.count("scrape.rows", n)`. Spans are timed with the monotonic
+`perf_counter_ns` clock. `timed_iter` times only the work spent producing
+items from an iterator, which separates record building from the DB writes
+that consume the records.
+
+At the end of a run `write_report()` writes:
+
+- `TRACE_REPORT`: a JSON summary with per-span count, total, mean, p50,
+  p95 and max, plus the counters.
+- `TRACE_CHROME`: the individual spans in Chrome trace format, for
+  chrome://tracing or https://ui.perfetto.dev.
+
+Both paths go through `time.strftime`, so `trace-%Y%m%d-%H%M%S.json` gives
+one file per run. Nothing is written when neither variable is set.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+# Individual spans kept for the Chrome trace; aggregates are always kept.
+MAX_EVENTS = int(os.environ.get("TRACE_MAX_EVENTS", "100000"))
+
+
+def _quantile(sorted_values, q):
+    """Nearest-rank quantile of an already sorted list."""
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class Tracer:
+    """Collects spans and counters for one pipeline run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discards everything recorded so far and restarts the run clock."""
+        with self._lock:
+            self.durations = defaultdict(list)
+            self.counters = Counter()
+            self.events = []
+            self.dropped_events = 0
+            self.started_at = time.time()
+            self._origin_ns = time.perf_counter_ns()
+
+    def _add(self, name, start_ns, duration_ns, attrs):
+        """Records one finished span."""
+        with self._lock:
+            self.durations[name].append(duration_ns)
+            if len(self.events) < MAX_EVENTS:
+                self.events.append(
+                    (name, start_ns, duration_ns, threading.get_ident(), attrs)
+                )
+            else:
+                self.dropped_events += 1
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Times the enclosed block as one span named `name`.
+
+        Args:
+            name (str): Stage name, e.g. "scrape.fetch".
+            **attrs: Extra values shown on the span in the Chrome trace.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.perf_counter_ns() - start, attrs)
+
+    def traced(self, name):
+        """Decorator that runs every call of the function inside a span."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def timed_iter(self, name, iterable):
+        """
+        Yields from `iterable`, recording the time spent producing items.
+
+        The consumer's time between items is not counted. One span is
+        recorded when iteration ends, with the item count as an attribute.
+        """
+        start = time.perf_counter_ns()
+        busy = 0
+        items = 0
+        iterator = iter(iterable)
+        try:
+            while True:
+                before = time.perf_counter_ns()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    busy += time.perf_counter_ns() - before
+                items += 1
+                yield item
+        finally:
+            self._add(name, start, busy, {"items": items})
+
+    def count(self, name, n=1):
+        """Adds `n` to counter `name`."""
+        with self._lock:
+            self.counters[name] += n
+
+    def report(self):
+        """
+        Summarizes the run.
+
+        Returns:
+            dict: wall time, per-span statistics (seconds) and counters.
+        """
+        with self._lock:
+            durations = {k: sorted(v) for k, v in self.durations.items()}
+            counters = dict(self.counters)
+            wall = (time.perf_counter_ns() - self._origin_ns) / 1e9
+        spans = {}
+        for name, values in sorted(durations.items()):
+            total = sum(values)
+            spans[name] = {
+                "count": len(values),
+                "total_s": round(total / 1e9, 6),
+                "mean_s": round(total / len(values) / 1e9, 6),
+                "p50_s": round(_quantile(values, 0.50) / 1e9, 6),
+                "p95_s": round(_quantile(values, 0.95) / 1e9, 6),
+                "max_s": round(values[-1] / 1e9, 6),
+            }
+        return {
+            "started_at": time.strftime(
+                "%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started_at)
+            ),
+            "pid": os.getpid(),
+            "wall_s": round(wall, 6),
+            "spans": spans,
+            "counters": counters,
+        }
+
+    def chrome_trace(self):
+        """
+        Returns the spans as a Chrome trace ("X" complete events, in µs).
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            dropped = self.dropped_events
+        trace = [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - self._origin_ns) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": attrs,
+            }
+            for name, start, duration, tid, attrs in events
+        ]
+        return {"traceEvents": trace, "otherData": {"dropped_events": dropped}}
+
+    def write_report(self, report_path=None, chrome_path=None):
+        """
+        Writes the JSON report and/or Chrome trace for this run.
+
+        Args:
+            report_path: Defaults to the TRACE_REPORT environment variable.
+            chrome_path: Defaults to the TRACE_CHROME environment variable.
+
+        Returns:
+            list: Paths written (empty when tracing output is off).
+        """
+        report_path = report_path or os.environ.get("TRACE_REPORT")
+        chrome_path = chrome_path or os.environ.get("TRACE_CHROME")
+        written = []
+        for path, build in ((report_path, self.report),
+                            (chrome_path, self.chrome_trace)):
+            if not path:
+                continue
+            path = time.strftime(path)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(build(), f, indent=2)
+            written.append(path)
+        return written
+
+
+# Process-wide tracer used by the pipeline modules.
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced
+timed_iter = TRACER.timed_iter
+count = TRACER.count
+write_report = TRACER.write_report
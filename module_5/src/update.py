@@ -4,11 +4,18 @@ Calls scrape_data.py to fetch the latest results from The Grad Cafe.
 Cleans and processes data using clean.py and the LLM-based reformatter.
 Stores results into JSON files, which are later inserted into the database via reload_data.py.
 """
+import importlib.util
 import json
+import logging
 import os
-import subprocess
+import time
+import urllib3
+from . import codec, line_index, tracing
 from .scrape_data import scrape_page
-from .utils import HTTP_POOL_MANAGER, DEFAULT_USER_AGENT
+from .utils import (
+    HTTP_POOL_MANAGER, DEFAULT_USER_AGENT,
+    iter_json_array, iter_json_objects, iter_jsonl,
+)
 
 # Module 2 just means old file and module 3 means file after updating.
 # Naming has no effect on refreshing data beyond this module
@@ -17,11 +24,22 @@ MODULE3_FILE = "module_3/applicant_data_fixed.jsonl"
 LLM_APP_FILE = "module_2/llm_hosting/app.py"  # Path to your LLM CLI script
 MAX_PAGE = 2000  # max number of pages to try if no stop condition
 
+# Long-lived standardizer (`python module_2/llm_hosting/app.py --serve`).
+# When it is not reachable the LLM app is imported and run in-process instead.
+STANDARDIZER_URL = os.environ.get("STANDARDIZER_URL", "http://127.0.0.1:8000")
+STANDARDIZER_TIMEOUT = float(os.environ.get("STANDARDIZER_TIMEOUT", "600"))
+# How long to wait for a service that is still loading its model.
+STANDARDIZER_READY_TIMEOUT = float(
+    os.environ.get("STANDARDIZER_READY_TIMEOUT", "120")
+)
+
 # Temp files to store in different json formats after scraping and
 # running through LLM
 TEMP_INPUT_FILE = "module_3/temp_new_rows.json"
 TEMP_OUTPUT_FILE = "module_3/temp_new_rows_llm.json"
 
+logger = logging.getLogger(__name__)
+
 
 def convert_to_jsonl(input_file, output_file):
     """
@@ -32,32 +50,10 @@ def convert_to_jsonl(input_file, output_file):
         input_file (str): Path to the input JSON file (containing an array).
         output_file (str): Path for the output JSONL file.
     """
-    objs = []
-    buffer = ""
-
-    # Read and parse objects
-    with open(input_file, "r", encoding="utf-8") as infile:
-
-        for line in infile:
-            line = line.strip()
-            if not line:
-                continue
-            buffer += line
-            try:
-                obj = json.loads(buffer)
-                objs.append(obj)
-                buffer = ""  # reset after parse
-            except json.JSONDecodeError:
-                # keep accumulating until valid JSON object
-                continue
-
-    # Save in JSONL format (1 object per line)
-    with open(output_file, "w", encoding="utf-8") as outfile:
-        for obj in objs:
-            outfile.write(json.dumps(obj, ensure_ascii=False))
-            outfile.write("\n")
-
-    print(f"Converted {len(objs)} objects → {output_file}")
+    # Stream objects straight into JSONL (1 object per line) with its index
+    count = line_index.write_jsonl(output_file, iter_json_objects(input_file))
+
+    print(f"Converted {count} objects → {output_file}")
 
 
 # convert_to_jsonl(MODULE2_FILE, MODULE3_FILE) # This line was likely for initial setup
@@ -66,30 +62,25 @@ def load_jsonl(filepath):
     """
     Loads a JSONL file (one JSON object per line) into a list of dictionaries.
 
+    Use `utils.iter_jsonl` to stream the file instead.
+
     Args:
         filepath (str): Path to the JSONL file.
 
     Returns:
         list: A list of dictionaries representing the JSON objects.
     """
-    data = []
     if not os.path.exists(filepath):
-        return data
-    with open(filepath, "r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
-            if line:
-                try:
-                    data.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    print(f"Skipping invalid JSON line: {line[:50]}... Error: {e}")
-    return data
+        return []
+    return list(iter_jsonl(filepath))
 
 
 def load_json_array(filepath):
     """
     Loads a JSON array from a file into a list of dictionaries.
 
+    Use `utils.iter_json_array` to stream the file instead.
+
     Args:
         filepath (str): Path to the JSON array file.
 
@@ -98,26 +89,22 @@ def load_json_array(filepath):
     """
     if not os.path.exists(filepath):
         return []
-    with open(filepath, "r", encoding="utf-8") as file2:
-        try:
-            return json.load(file2)
-        except json.JSONDecodeError as e:
-            print(f"Failed to load JSON array: {e}")
-            return []
+    try:
+        return list(iter_json_array(filepath))
+    except json.JSONDecodeError as e:
+        print(f"Failed to load JSON array: {e}")
+        return []
 
 
 def save_jsonl(data, filepath):
     """
-    Saves a list of dictionaries as a JSONL file.
+    Saves a list of dictionaries as a JSONL file, plus its line index.
 
     Args:
         data (list): List of dictionaries to save.
         filepath (str): Path to the output JSONL file.
     """
-    with open(filepath, "w", encoding="utf-8") as file3:
-        for row in data:
-            json.dump(row, file3, ensure_ascii=False)
-            file3.write("\n")
+    line_index.write_jsonl(filepath, data)
 
 
 def save_json_array(data, filepath):
@@ -129,31 +116,168 @@ def save_json_array(data, filepath):
         filepath (str): Path to the output JSON array file.
     """
     with open(filepath, "w", encoding="utf-8") as file4:
-        json.dump(data, file4, ensure_ascii=False, indent=4)
+        file4.write(codec.dumps_pretty(data))
+
+
+_STANDARDIZER_MODULE = None
+
+
+def _standardizer_available(base_url):
+    """
+    Checks the standardizer's readiness endpoint, waiting while it warms up.
+
+    A 200 from ``/ready`` means the model is loaded. A 503 while the service
+    reports ``loading`` is polled until ``STANDARDIZER_READY_TIMEOUT``; a 503
+    with nothing loading means it loads lazily, so it is used as-is.
+
+    Args:
+        base_url (str): Base URL of the standardizer service.
+
+    Returns:
+        bool: True if the service should be used.
+    """
+    deadline = time.monotonic() + STANDARDIZER_READY_TIMEOUT
+    while True:
+        try:
+            response = HTTP_POOL_MANAGER.request(
+                "GET", f"{base_url}/ready",
+                timeout=urllib3.Timeout(total=2.0), retries=False
+            )
+        except urllib3.exceptions.HTTPError:
+            return False
+        if response.status == 200:
+            return True
+        if response.status != 503:
+            return False
+        status = codec.loads(response.data or b"{}")
+        if status.get("error"):
+            print(f"Standardizer failed to load its model: {status['error']}")
+            return False
+        if not status.get("loading"):
+            return True
+        if time.monotonic() >= deadline:
+            print("Standardizer still loading its model; running in-process.")
+            return False
+        time.sleep(1.0)
+
+
+def _ndjson_body(input_file):
+    """Yields the input rows as NDJSON lines, one encoded row at a time."""
+    for row in iter_json_array(input_file):
+        yield (codec.dumps(row) + "\n").encode("utf-8")
+
+
+def _run_llm_via_service(input_file, output_file, base_url):
+    """
+    Streams rows through the standardizer service's NDJSON endpoint.
+
+    The request body is sent chunked from a generator and each standardized
+    row is appended as it arrives, so neither side holds the whole file. If
+    the stream fails part-way, the in-process fallback resumes the output
+    and skips the rows already written (by ``url``).
+
+    Rows the service rejects are logged and counted, not written.
+
+    Args:
+        input_file (str): Path to the input JSON array file.
+        output_file (str): Path to the JSONL output file (appended to).
+    """
+    response = HTTP_POOL_MANAGER.request(
+        "POST", f"{base_url}/standardize/stream",
+        body=_ndjson_body(input_file),
+        headers={"Content-Type": "application/x-ndjson"},
+        timeout=urllib3.Timeout(connect=2.0, read=STANDARDIZER_TIMEOUT),
+        retries=False,
+        preload_content=False,
+    )
+    written = rejected = 0
+    try:
+        if response.status != 200:
+            raise RuntimeError(f"standardizer returned HTTP {response.status}")
+        with open(output_file, "a", encoding="utf-8") as out:
+            for line in response:
+                line = line.strip()
+                if not line:
+                    continue
+                row = codec.loads(line)
+                # Error objects are the only lines without the LLM fields;
+                # an input row may carry its own "error" key.
+                if "llm-generated-program" not in row:
+                    rejected += 1
+                    logger.warning(
+                        "Standardizer rejected input line %s: %s",
+                        row.get("line"), row.get("error"),
+                    )
+                    continue
+                out.write(line.decode("utf-8") + "\n")
+                written += 1
+    finally:
+        response.release_conn()
+        tracing.count("llm.rows", written)
+        tracing.count("llm.rejected", rejected)
+
+    print(f"Standardized {written} rows via {base_url} ({rejected} rejected)")
+
+
+def _run_llm_in_process(input_file, output_file):
+    """
+    Imports the LLM app once and runs its CLI file processing in this process.
+
+    Args:
+        input_file (str): Path to the input JSON array file.
+        output_file (str): Path to the JSONL output file (appended to).
+    """
+    global _STANDARDIZER_MODULE  # pylint: disable=global-statement
+    if _STANDARDIZER_MODULE is None:
+        spec = importlib.util.spec_from_file_location(
+            "llm_standardizer", LLM_APP_FILE
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        # Time each inference call; the CLI loop looks it up on the module.
+        module.instrument(
+            lambda _name, stage: tracing.traced("llm.call")(stage), ("_call_llm",)
+        )
+        _STANDARDIZER_MODULE = module
+
+    with tracing.span("llm.in_process"):
+        _STANDARDIZER_MODULE.process_file(
+            input_file, output_file, append=True, batch=True
+        )
 
 
 def run_llm_on_file(input_file, output_file):
     """
-    Calls the LLM CLI script to process a JSON file and add additional columns.
+    Standardizes a JSON file with the LLM and appends the rows to a JSONL file.
+
+    Uses the long-lived standardizer service at ``STANDARDIZER_URL`` when it
+    is up (the model is already loaded there), and otherwise falls back to
+    running the LLM app in-process.
 
     Args:
         input_file (str): Path to the input JSON file.
         output_file (str): Path to the output JSON file.
     """
-    subprocess.run([
-        "python", LLM_APP_FILE,
-        "--file", input_file,
-        "--out", output_file,
-        "--append"  # optional
-    ], check=True)
+    with tracing.span("llm.ready_check"):
+        available = _standardizer_available(STANDARDIZER_URL)
+    if available:
+        try:
+            with tracing.span("llm.service"):
+                _run_llm_via_service(input_file, output_file, STANDARDIZER_URL)
+            return
+        except (urllib3.exceptions.HTTPError, RuntimeError, ValueError) as e:
+            print(f"Standardizer service failed ({e}); running in-process.")
+    _run_llm_in_process(input_file, output_file)
 
 
 def update_data():
     """
     Scrapes new data, processes it with the LLM, and prepares it for insertion.
     """
-    existing_data = load_jsonl(MODULE3_FILE)
-    latest_url = existing_data[0]["url"] if existing_data else None
+    # Only the newest row is needed: read it through the line index
+    # instead of parsing the whole file.
+    latest = line_index.first_record(MODULE3_FILE)
+    latest_url = latest["url"] if latest else None
 
     print(f"Latest URL in JSONL: {latest_url}")
 
@@ -166,12 +290,13 @@ def update_data():
 
     for page in range(1, MAX_PAGE + 1):
         # Now, call scrape_page with the required arguments
-        rows = scrape_page(page, http_pool_manager, user_agent)
+        with tracing.span("update.scrape_page", page=page):
+            rows = scrape_page(page, http_pool_manager, user_agent)
         if not rows:
             break
 
         for row in rows:
-            if row["url"] == latest_url:
+            if row.url == latest_url:
                 stop_scraping = True
                 break
             new_rows.append(row)
@@ -179,87 +304,87 @@ def update_data():
         if stop_scraping:
             break
 
+    tracing.count("update.new_rows", len(new_rows))
     if not new_rows:
         print("No new rows found. JSONL is up to date.")
         return
 
     print(f"Found {len(new_rows)} new rows. Running LLM standardization...")
 
-    save_json_array(new_rows, TEMP_INPUT_FILE)
+    with tracing.span("update.save_input"):
+        save_json_array([row.to_json_dict() for row in new_rows], TEMP_INPUT_FILE)
 
     # Call LLM CLI to process
-    run_llm_on_file(TEMP_INPUT_FILE, TEMP_OUTPUT_FILE)
+    with tracing.span("llm.run"):
+        run_llm_on_file(TEMP_INPUT_FILE, TEMP_OUTPUT_FILE)
 
 def load_json_objects(filepath):
     """
     Loads newline-separated JSON objects from a file into a list.
 
+    Use `utils.iter_json_objects` to stream the file instead.
+
     Args:
         filepath (str): Path to the JSON file with newline-separated objects.
 
     Returns:
         list: List of dictionaries.
     """
-    objs = []
-    with open(filepath, "r", encoding="utf-8") as file5:
-        buffer = ""
-        for line in file5:
-            line = line.strip()
-            if not line:
-                continue
-            buffer += line
-            # Try parsing object
-            try:
-                obj = json.loads(buffer)
-                objs.append(obj)
-                buffer = ""  # reset after successful parse
-            except json.JSONDecodeError:
-                # not complete yet, keep accumulating
-                continue
-    return objs
+    return list(iter_json_objects(filepath))
 
 
 def save_json_objects(filepath, objs):
     """
-    Saves a list of dictionaries as newline-separated JSON objects.
+    Saves a list of dictionaries as newline-separated JSON objects,
+    plus its line index.
 
     Args:
         filepath (str): Path to the output JSON file.
         objs (list): List of dictionaries to save.
     """
-    with open(filepath, "w", encoding="utf-8") as file6:
-        for obj in objs:
-            json.dump(obj, file6, ensure_ascii=False)
-            file6.write("\n")
+    line_index.write_jsonl(filepath, objs)
 
 
 def prepend_llm_to_app(llm_file, app_file):
     """
     Prepends data from the LLM output file to the main applicant data file.
 
+    Both files are streamed into a temporary file that then replaces
+    `app_file`, so only one row is held in memory at a time.
+
     Args:
         llm_file (str): Path to the LLM processed data file.
         app_file (str): Path to the main applicant data file.
     """
-    # Load both
-    llm_objs = load_json_objects(llm_file)
-    app_objs = load_json_objects(app_file)
-
-    # Prepend LLM rows to application rows
-    combined = llm_objs + app_objs
+    # Open both up front so a missing file fails before anything is written
+    llm_objs = iter_json_objects(llm_file)
+    app_objs = iter_json_objects(app_file)
+    llm_count = 0
+
+    def combined():
+        # Prepend LLM rows to application rows
+        nonlocal llm_count
+        for obj in llm_objs:
+            llm_count += 1
+            yield obj
+        yield from app_objs
 
     # Save back to app_file
-    save_json_objects(app_file, combined)
+    total = line_index.write_jsonl(app_file, combined())
 
-    print(f"Prepended {len(llm_objs)} LLM rows. New total: {len(combined)}")
+    print(f"Prepended {llm_count} LLM rows. New total: {total}")
 
 if __name__ == "__main__":
-    update_data()
-    prepend_llm_to_app(TEMP_OUTPUT_FILE, MODULE2_FILE)
-
-    # Remove temporary files
-    files_to_delete = [MODULE3_FILE, TEMP_INPUT_FILE]
-    for f in files_to_delete:
-        if os.path.exists(f):
-            os.remove(f)
-            print(f"Deleted: {f}")
+    with tracing.span("update.update_data"):
+        update_data()
+    with tracing.span("update.prepend"):
+        prepend_llm_to_app(TEMP_OUTPUT_FILE, MODULE2_FILE)
+
+    # Remove temporary files (the JSONL file together with its .idx sidecar)
+    for f in line_index.remove(MODULE3_FILE):
+        print(f"Deleted: {f}")
+    if os.path.exists(TEMP_INPUT_FILE):
+        os.remove(TEMP_INPUT_FILE)
+        print(f"Deleted: {TEMP_INPUT_FILE}")
+
+    tracing.write_report()
@@ -3,26 +3,177 @@ Fix pylint duplication error and added urllib3 config
 """
 import json
 import urllib3
+from . import codec
+from .codec import decode_record
 
 def create_record_from_json(line):
     """Processes a JSON string and returns a data record tuple."""
-    json_data = json.loads(line)
-    return (
-        json_data.get('program'),
-        json_data.get('comments'),
-        json_data.get('date_added'),
-        json_data.get('url'),
-        json_data.get('status'),
-        json_data.get('term'),
-        json_data.get('US/International'),
-        json_data.get('GPA'),
-        json_data.get('GRE'),
-        json_data.get('GRE V'),
-        json_data.get('GRE AW'),
-        json_data.get('Degree'),
-        json_data.get('llm-generated-program'),
-        json_data.get('llm-generated-university')
-    )
+    return decode_record(line).to_db_tuple()
+
+
+def _select(objs, where=None, fields=None):
+    """
+    Filters and projects decoded objects lazily.
+
+    Args:
+        objs: Iterable of dictionaries.
+        where: Optional predicate; objects it rejects are dropped.
+        fields: Optional sequence of keys; each object is cut down to a
+            new dictionary with just those keys (missing ones are None).
+    """
+    for obj in objs:
+        if where is not None and not where(obj):
+            continue
+        if fields is not None:
+            obj = {key: obj.get(key) for key in fields}
+        yield obj
+
+
+def _jsonl_lines(file, decode):
+    """Decodes each non-blank line of an open binary file, then closes it."""
+    with file:
+        for line in file:
+            line = line.strip()
+            if line:
+                try:
+                    yield decode(line)
+                except json.JSONDecodeError as e:
+                    print(f"Skipping malformed JSON line: "
+                          f"{line[:50].decode('utf-8', 'replace')}... Error: {e}")
+
+
+def _accumulated_objects(file):
+    """Yields JSON objects that may span several lines, then closes the file."""
+    with file:
+        buffer = ""
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            buffer += line
+            try:
+                obj = codec.loads(buffer)
+            except json.JSONDecodeError:
+                # not complete yet, keep accumulating
+                continue
+            buffer = ""
+            yield obj
+
+
+def _array_items(file, chunk_size):
+    """Yields the elements of a top-level JSON array of objects, then closes."""
+    decoder = json.JSONDecoder()
+    with file:
+        buf = file.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise json.JSONDecodeError("Expecting '['", buf, 0)
+        pos, eof = 1, False
+        while True:
+            # Skip separators, reading more text when the buffer runs out.
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos == len(buf):
+                    raise json.JSONDecodeError("Unterminated array", buf, pos)
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # An element cut off by the chunk boundary: read more.
+                if eof:
+                    raise
+                more = file.read(chunk_size)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+            yield obj
+
+
+def iter_jsonl(filepath, where=None, fields=None):
+    """
+    Streams the objects of a JSON Lines file, skipping malformed lines.
+
+    The file is opened straight away (so a missing file fails here), but
+    lines are only read and decoded as the caller iterates.
+
+    Args:
+        filepath: Path to the JSON Lines file.
+        where: Optional predicate to filter objects.
+        fields: Optional sequence of keys to project each object onto.
+
+    Returns:
+        Generator of dictionaries
+    """
+    file = open(filepath, 'rb')  # pylint: disable=consider-using-with
+    return _select(_jsonl_lines(file, codec.loads), where, fields)
+
+
+def iter_json_objects(filepath, where=None, fields=None):
+    """
+    Streams newline-separated JSON objects, compact or pretty-printed.
+
+    Lines are joined until they parse as one object, so an object may
+    span several lines.
+
+    Args:
+        filepath: Path to the file.
+        where: Optional predicate to filter objects.
+        fields: Optional sequence of keys to project each object onto.
+
+    Returns:
+        Generator of dictionaries
+    """
+    file = open(filepath, 'r', encoding='utf-8')  # pylint: disable=consider-using-with
+    return _select(_accumulated_objects(file), where, fields)
+
+
+def iter_json_array(filepath, where=None, fields=None, chunk_size=1 << 16):
+    """
+    Streams the elements of a JSON array file without reading it whole.
+
+    The file is read `chunk_size` characters at a time and each element is
+    decoded as soon as it is complete. Invalid JSON raises
+    `json.JSONDecodeError` when the iterator reaches it.
+
+    Args:
+        filepath: Path to the JSON array file.
+        where: Optional predicate to filter objects.
+        fields: Optional sequence of keys to project each object onto.
+        chunk_size: Characters read per chunk.
+
+    Returns:
+        Generator of dictionaries
+    """
+    file = open(filepath, 'r', encoding='utf-8')  # pylint: disable=consider-using-with
+    return _select(_array_items(file, chunk_size), where, fields)
+
+
+def iter_records(jsonl_file_path):
+    """
+    Streams record tuples from a JSON Lines file, skipping malformed lines.
+
+    Args:
+        jsonl_file_path: The path to the JSON Lines file.
+
+    Returns:
+        Generator of record tuples in `APPLICANT_COLUMNS` order
+    """
+    file = open(jsonl_file_path, 'rb')  # pylint: disable=consider-using-with
+    return _jsonl_lines(file, create_record_from_json)
+
+
+def read_jsonl_records(jsonl_file_path):
+    """
+    Reads record tuples from a JSON Lines file, skipping malformed lines.
+
+    Args:
+        jsonl_file_path: The path to the JSON Lines file.
+
+    Returns:
+        List of record tuples in `APPLICANT_COLUMNS` order
+    """
+    return list(iter_records(jsonl_file_path))
 
 HTTP_POOL_MANAGER = urllib3.PoolManager()
 DEFAULT_USER_AGENT = (
@@ -0,0 +1,104 @@
+"""Tests for the offline NumPy analytics engine."""
+
+import json
+import pytest
+from module_5.src.analytics import ApplicantColumns, compute_metrics
+
+# pylint: disable=redefined-outer-name
+
+
+def _row(**overrides):
+    """Build an applicant JSON row with sensible defaults."""
+    row = {
+        "program": "Computer Science, Johns Hopkins University",
+        "url": "u",
+        "status": "Accepted on 1 Mar",
+        "term": "Fall 2025",
+        "US/International": "American",
+        "GPA": "3.50",
+        "GRE": "320",
+        "GRE V": "160",
+        "GRE AW": "4.5",
+        "Degree": "Masters",
+        "llm-generated-program": "Computer Science",
+        "llm-generated-university": "Johns Hopkins University",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    """Small applicant JSONL covering NULLs, LIKE patterns and NOT IN."""
+    rows = [
+        _row(),
+        _row(**{"US/International": "International", "GPA": "3.90"}),
+        _row(**{"US/International": None, "GPA": None, "status": "Rejected"}),
+        _row(**{"US/International": "Other", "GPA": "n/a", "term": "Spring 2025"}),
+        _row(**{
+            "Degree": "PhD", "term": "Fall 2025",
+            "llm-generated-university": "Georgetown University",
+            "GPA": "3.00",
+        }),
+        _row(**{
+            "term": "Fall 2023", "status": "Wait listed",
+            "llm-generated-university": "University of Chicago",
+        }),
+        _row(**{
+            "Degree": "PhD", "GPA": "4.00", "GRE": None,
+            "llm-generated-university": "Boston University",
+        }),
+    ]
+    path = tmp_path / "applicants.jsonl"
+    lines = [json.dumps(r) for r in rows] + ["{not json"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.analysis
+def test_metrics_follow_sql_semantics(jsonl_path):
+    """Counts, LIKE filters and NULL handling match the SQL queries."""
+    metrics = compute_metrics(ApplicantColumns.from_jsonl(jsonl_path))
+
+    assert metrics["total_count"] == 7
+    assert metrics["international_count"] == 1
+    assert metrics["us_count"] == 4
+    # NOT IN never matches NULL, so only the "Other" row counts.
+    assert metrics["other_count"] == 1
+    assert metrics["percent_international"] == pytest.approx(100 / 7)
+
+    assert metrics["fall_2025_total_count"] == 5
+    assert metrics["acceptance_count"] == 4
+    assert metrics["acceptance_percent"] == pytest.approx(80.0)
+    assert metrics["avg_gpa_accepted"] == pytest.approx((3.5 + 3.9 + 3.0 + 4.0) / 4)
+    assert metrics["avg_gpa_american"] == pytest.approx((3.5 + 3.0 + 4.0) / 3)
+
+    assert metrics["jhu_masters_cs_count"] == 4
+    assert metrics["gtu_phd_25"] == 1
+    assert metrics["uc_cs_23"] == 1
+    assert metrics["bu_phd"] == pytest.approx(4.0)
+
+
+@pytest.mark.analysis
+def test_avg_metrics_require_all_scores(jsonl_path):
+    """The four averages only use rows where every score is present."""
+    avg_gpa, avg_gre, avg_gre_v, avg_gre_aw = compute_metrics(
+        ApplicantColumns.from_jsonl(jsonl_path)
+    )["avg_metrics"]
+
+    assert avg_gpa == pytest.approx((3.5 + 3.9 + 3.0 + 3.5) / 4)
+    assert avg_gre == pytest.approx(320.0)
+    assert avg_gre_v == pytest.approx(160.0)
+    assert avg_gre_aw == pytest.approx(4.5)
+
+
+@pytest.mark.analysis
+def test_empty_snapshot_matches_empty_table():
+    """No rows gives zero counts and None averages, like AVG over nothing."""
+    metrics = compute_metrics(ApplicantColumns.from_records([]))
+
+    assert metrics["total_count"] == 0
+    assert metrics["percent_international"] == 0
+    assert metrics["acceptance_percent"] == 0
+    assert metrics["avg_metrics"] == (None, None, None, None)
+    assert metrics["bu_phd"] is None
@@ -0,0 +1,45 @@
+"""Tests for the benchmark data generator and regression check."""
+
+import pytest
+from module_5.benchmarks.run import compare
+from module_5.benchmarks.synthetic import ensure_dataset, generate_rows
+from module_5.src.record import ApplicantRecord
+from module_5.src.utils import read_jsonl_records
+
+
+@pytest.mark.analysis
+def test_generate_rows_is_deterministic_and_loadable(tmp_path):
+    """Same seed, same rows; every row converts to a record the loader takes."""
+    rows = list(generate_rows(500, seed=7))
+
+    assert rows == list(generate_rows(500, seed=7))
+    assert len({row["url"] for row in rows}) == 500
+    assert any(
+        row["llm-generated-university"] == "Johns Hopkins University"
+        and row["Degree"] == "Masters" for row in rows
+    )
+    records = [ApplicantRecord.from_dict(row) for row in rows]
+    assert all(record.program and record.term for record in records)
+
+    path = ensure_dataset(str(tmp_path), 500, seed=7)
+    assert ensure_dataset(str(tmp_path), 500, seed=7) == path
+    assert read_jsonl_records(path) == [r.to_db_tuple() for r in records]
+
+
+@pytest.mark.analysis
+def test_compare_flags_only_real_regressions():
+    """Slowdowns must exceed both the tolerance and the minimum delta."""
+    baseline = {"10k": {"load": 1.0, "metrics": 0.001}}
+    report = {
+        "10k": {
+            "load": {"median_s": 1.5},
+            "metrics": {"median_s": 0.002},
+            "index": {"median_s": 9.0},
+        }
+    }
+
+    regressions = compare(report, baseline, tolerance=0.2, min_delta=0.005)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("10k load regressed +50.0%")
+    assert not compare(report, baseline, tolerance=0.6, min_delta=0.005)
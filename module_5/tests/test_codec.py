@@ -0,0 +1,55 @@
+"""Tests for the pluggable JSON codec backends."""
+
+import importlib
+import json
+import pytest
+from module_5.src import codec
+from module_5.src.record import ApplicantRecord
+
+ROW = {
+    "program": "Informatique, Université de Montréal",
+    "url": "https://www.thegradcafe.com/result/1",
+    "GPA": "3.90",
+    "GRE V": 165,
+    "US/International": "International",
+}
+
+
+@pytest.fixture(params=["stdlib", "orjson", "msgspec"])
+def backend(request, monkeypatch):
+    """Reload the codec with each installed backend forced on."""
+    name = request.param
+    if name != "stdlib":
+        pytest.importorskip(name)
+    monkeypatch.setenv("JSON_CODEC", name)
+    yield importlib.reload(codec)
+    monkeypatch.delenv("JSON_CODEC")
+    importlib.reload(codec)
+
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.mark.analysis
+def test_round_trip_matches_stdlib(backend):
+    """Every backend reads stdlib output and writes what stdlib reads."""
+    line = backend.dumps(ROW)
+
+    assert "\n" not in line
+    assert "Université" in line
+    assert json.loads(line) == ROW
+    assert backend.loads(json.dumps(ROW)) == ROW
+    assert backend.loads(line.encode("utf-8")) == ROW
+    assert backend.dumps_pretty(ROW) == json.dumps(ROW, ensure_ascii=False, indent=4)
+    assert backend.dumps_pretty(ROW, ensure_ascii=True) == json.dumps(ROW, indent=4)
+
+
+@pytest.mark.analysis
+def test_decode_record_and_errors(backend):
+    """Lines decode into records; bad input raises json.JSONDecodeError."""
+    assert backend.decode_record(json.dumps(ROW)) == ApplicantRecord.from_dict(ROW)
+
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads("{not json")
+    with pytest.raises(json.JSONDecodeError):
+        backend.decode_record('{"program": ')
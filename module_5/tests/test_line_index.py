@@ -0,0 +1,102 @@
+"""Tests for the memory-mapped JSONL line index."""
+
+import os
+import pytest
+from module_5.src import line_index
+from module_5.src.line_index import (
+    LineIndex, build_index, first_record, open_or_build, write_jsonl,
+)
+
+ROWS = [{"url": f"u{i}", "program": f"Program {i}"} for i in range(50)]
+
+
+@pytest.mark.analysis
+def test_write_jsonl_index_supports_random_access(tmp_path):
+    """Records are readable by number and by URL without a scan."""
+    path = str(tmp_path / "rows.jsonl")
+    assert write_jsonl(path, ROWS) == 50
+
+    with LineIndex.open(path) as index:
+        assert len(index) == 50
+        assert index.get(0) == ROWS[0]
+        assert index.get(-1) == ROWS[-1]
+        assert index.find_url("u37") == 37
+        assert index.find_url("missing") is None
+        assert list(index.iter_reverse())[:2] == [ROWS[49], ROWS[48]]
+
+    assert first_record(path) == ROWS[0]
+
+
+@pytest.mark.analysis
+def test_stale_index_is_ignored_and_rebuilt(tmp_path):
+    """Appending to the file invalidates the index until it is rebuilt."""
+    path = str(tmp_path / "rows.jsonl")
+    write_jsonl(path, ROWS[:3])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\nnot json\n{\"url\": \"late\"}\n")
+
+    assert LineIndex.open(path) is None
+    assert first_record(path) == ROWS[0]
+
+    build_index(path)
+    with LineIndex.open(path) as index:
+        assert len(index) == 4
+        assert index.get(2) == ROWS[2]
+        assert index.find_url("late") == 3
+
+
+@pytest.mark.analysis
+def test_missing_file_and_index(tmp_path):
+    """No file means no index and no first record."""
+    path = str(tmp_path / "absent.jsonl")
+
+    assert LineIndex.open(path) is None
+    assert first_record(path) is None
+    assert not os.path.exists(line_index.index_path(path))
+
+
+@pytest.mark.analysis
+def test_first_record_skips_malformed_first_line(tmp_path):
+    """A broken or blank first line is skipped, with or without an index."""
+    path = str(tmp_path / "rows.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"url": "u0", "program": \n\n[1, 2]\n{"url": "u1"}\n')
+
+    assert first_record(path) == {"url": "u1"}
+    build_index(path)
+    assert first_record(path) == {"url": "u1"}
+
+
+@pytest.mark.analysis
+def test_open_or_build_without_writing_a_sidecar(tmp_path, monkeypatch):
+    """persist=False, or an unwritable directory, keeps the index in memory."""
+    path = str(tmp_path / "rows.jsonl")
+    write_jsonl(path, ROWS)
+    os.remove(line_index.index_path(path))
+
+    with open_or_build(path, persist=False) as index:
+        assert len(index) == 50
+        assert index.find_url("u12") == 12
+        assert list(index.iter_reverse())[-1] == ROWS[0]
+    assert not os.path.exists(line_index.index_path(path))
+
+    def read_only(*_):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(line_index.LineIndexBuilder, "save", read_only)
+    with open_or_build(path) as index:
+        assert index.get(-1) == ROWS[-1]
+    assert not os.path.exists(line_index.index_path(path))
+
+
+@pytest.mark.analysis
+def test_remove_deletes_the_sidecar_too(tmp_path):
+    """Removing an indexed file leaves no orphaned .idx behind."""
+    path = str(tmp_path / "rows.jsonl")
+    write_jsonl(path, ROWS[:3])
+    assert os.path.exists(line_index.index_path(path))
+
+    assert line_index.remove(path) == [path, line_index.index_path(path)]
+    assert not os.path.exists(path)
+    assert not os.path.exists(line_index.index_path(path))
+    assert line_index.remove(path) == []
@@ -0,0 +1,108 @@
+"""Tests for the Prometheus-style metrics and the dashboard /metrics route."""
+
+from contextlib import contextmanager
+import psycopg_pool
+import pytest
+from module_5.src.metrics import Registry
+
+
+class StatsPool:
+    """Pool stand-in that reports stats but has no database behind it."""
+
+    # pylint: disable=R0903
+    def get_stats(self):
+        """Return fixed pool statistics."""
+        return {"pool_size": 4, "pool_available": 3, "requests_waiting": 0}
+
+    def connection(self, timeout=None):
+        """No database: the cache hit ratio collector must cope."""
+        raise psycopg_pool.PoolTimeout(f"no database (timeout={timeout})")
+
+
+class StatsDbPool(StatsPool):
+    """Pool stand-in whose connections answer the pg_stat_database query."""
+
+    def __init__(self):
+        self.connections = 0
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Count the checkout and hand out this object as the connection."""
+        self.connections += 1
+        yield self
+
+    def execute(self, _query):
+        """Return this object as the cursor."""
+        return self
+
+    def fetchone(self):
+        """blks_hit, blks_read."""
+        return (90, 10)
+
+
+@pytest.mark.web
+def test_registry_renders_exposition_format():
+    """Counters, gauges and histograms render as Prometheus text."""
+    registry = Registry()
+    runs = registry.counter("runs_total", "Runs.", ["result"])
+    ratio = registry.gauge("hit_ratio", "Ratio.")
+    latency = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1))
+    runs.inc(result='ok "quoted"')
+    runs.inc(2, result='ok "quoted"')
+    ratio.set(0.75)
+    latency.observe(0.05, route="/")
+    latency.observe(0.5, route="/")
+
+    text = registry.render()
+
+    assert '# TYPE runs_total counter' in text
+    assert 'runs_total{result="ok \\"quoted\\""} 3' in text
+    assert "hit_ratio 0.75" in text
+    assert 'latency_seconds_bucket{route="/",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{route="/"} 2' in text
+    with pytest.raises(ValueError):
+        runs.inc(status="ok")
+
+
+@pytest.mark.web
+def test_metrics_route_reports_requests_pool_and_scrape(monkeypatch):
+    """/metrics serves route latencies, pool stats and scrape status."""
+    from module_5.src.front_end import app as app_module  # pylint: disable=import-outside-toplevel
+
+    monkeypatch.setattr(app_module, "pool", StatsPool())
+    monkeypatch.setattr(app_module, "CACHE_HIT_RATIO_READ_AT", None)
+    client = app_module.app.test_client()
+
+    client.get("/metrics")
+    res = client.get("/metrics")
+    text = res.get_data(as_text=True)
+
+    assert res.status_code == 200
+    assert res.mimetype == "text/plain"
+    assert (
+        'dashboard_request_duration_seconds_count'
+        '{route="/metrics",method="GET",status="200"}'
+    ) in text
+    assert 'dashboard_pool_stat{stat="pool_size"} 4' in text
+    assert "dashboard_scrape_in_progress 0" in text
+    assert "dashboard_scrape_running_seconds 0" in text
+
+
+@pytest.mark.web
+def test_cache_hit_ratio_is_read_at_most_once_per_ttl(monkeypatch):
+    """Repeated scrapes reuse the last ratio instead of querying each time."""
+    from module_5.src.front_end import app as app_module  # pylint: disable=import-outside-toplevel
+
+    db_pool = StatsDbPool()
+    monkeypatch.setattr(app_module, "pool", db_pool)
+    monkeypatch.setattr(app_module, "CACHE_HIT_RATIO_READ_AT", None)
+    monkeypatch.setattr(app_module, "CACHE_HIT_RATIO_TTL", 3600)
+    client = app_module.app.test_client()
+
+    for _ in range(3):
+        text = client.get("/metrics").get_data(as_text=True)
+
+    assert db_pool.connections == 1
+    assert "dashboard_db_cache_hit_ratio 0.9" in text
@@ -0,0 +1,70 @@
+"""Tests for parallel chunked JSON Lines parsing."""
+
+import json
+import pytest
+from module_5.src import parallel_jsonl
+from module_5.src.parallel_jsonl import chunk_ranges, iter_records_parallel
+from module_5.src.utils import iter_records
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    """A JSONL file with uneven line lengths, a blank line and a bad line."""
+    path = tmp_path / "rows.jsonl"
+    lines = [
+        json.dumps({"url": f"u{i}", "comments": "é" * (i % 13), "GPA": "3.5"})
+        for i in range(300)
+    ]
+    lines[100:100] = ["", "{not json"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.mark.analysis
+def test_chunk_ranges_end_on_newlines(jsonl_file):
+    """Ranges are contiguous, cover the file and split only after newlines."""
+    with open(jsonl_file, "rb") as f:
+        data = f.read()
+    ranges = chunk_ranges(jsonl_file, chunk_bytes=500)
+
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1:end] == b"\n"
+
+
+@pytest.mark.analysis
+def test_parallel_records_match_serial_order(jsonl_file, monkeypatch):
+    """Worker processes produce the same records, in file order."""
+    monkeypatch.setattr(parallel_jsonl, "_available_cpus", lambda: 2)
+    expected = list(iter_records(jsonl_file))
+
+    assert len(expected) == 300
+    assert list(
+        iter_records_parallel(jsonl_file, workers=2, chunk_bytes=700, min_bytes=0)
+    ) == expected
+    assert list(iter_records_parallel(jsonl_file, workers=1)) == expected
+    with pytest.raises(FileNotFoundError):
+        iter_records_parallel(jsonl_file + ".missing", workers=2)
+
+
+@pytest.mark.analysis
+def test_small_files_and_single_cpu_stay_serial(jsonl_file, monkeypatch):
+    """No pool is started below min_bytes or with one usable CPU."""
+    def no_pool(*_):
+        raise AssertionError("worker pool started")
+
+    monkeypatch.setattr(parallel_jsonl, "_ordered_chunks", no_pool)
+    expected = list(iter_records(jsonl_file))
+
+    monkeypatch.setattr(parallel_jsonl, "_available_cpus", lambda: 4)
+    assert list(iter_records_parallel(jsonl_file, workers=4, chunk_bytes=700)) == expected
+
+    monkeypatch.setattr(parallel_jsonl, "_available_cpus", lambda: 1)
+    assert list(
+        iter_records_parallel(jsonl_file, workers=4, chunk_bytes=700, min_bytes=0)
+    ) == expected
@@ -0,0 +1,58 @@
+"""Tests for the Parquet export/import helpers."""
+
+import datetime
+import pytest
+
+pytest.importorskip("pyarrow")
+
+# pylint: disable=wrong-import-position
+from module_5.src.parquet_io import read_parquet_records, write_parquet
+
+
+def _rows():
+    """p_id + applicant column tuples across several term years."""
+    terms = ["Fall 2025", "Spring 2024", None, "Fall 2023"]
+    return [
+        (
+            p_id, f"Program {p_id % 3}", None, datetime.date(2025, 3, 1),
+            f"u{p_id}", "Accepted", terms[p_id % 4], "American",
+            3.5, None, 160.0, 4.0, "PhD",
+            "Computer Science", "Johns Hopkins University",
+        )
+        for p_id in range(1, 11)
+    ]
+
+
+@pytest.mark.db
+def test_parquet_round_trip_keeps_order_and_types(tmp_path):
+    """Rows read back in p_id order with NULLs, dates and floats intact."""
+    rows = _rows()
+    write_parquet(list(reversed(rows)), tmp_path)
+
+    partitions = sorted(p.name for p in tmp_path.iterdir())
+    assert "term_year=2025" in partitions
+    assert "term_year=2023" in partitions
+
+    assert list(read_parquet_records(tmp_path)) == [r[1:] for r in rows]
+
+
+@pytest.mark.db
+def test_export_replaces_stale_partitions(tmp_path):
+    """A second export is a full snapshot, not a merge."""
+    rows = _rows()
+    write_parquet(rows, tmp_path)
+    write_parquet(rows[:1], tmp_path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["term_year=2024"]
+    assert list(read_parquet_records(tmp_path)) == [rows[0][1:]]
+
+
+@pytest.mark.db
+def test_write_streams_rows_in_batches(tmp_path):
+    """A generator is written a batch at a time and reads back whole."""
+    rows = _rows()
+    assert write_parquet(iter(rows), tmp_path, batch_size=3) == len(rows)
+
+    files = list((tmp_path / "term_year=2025").iterdir())
+    assert len(files) > 1
+    assert list(read_parquet_records(tmp_path)) == [r[1:] for r in rows]
@@ -0,0 +1,123 @@
+"""Tests for the slow query logging cursor."""
+
+from contextlib import nullcontext
+import logging
+import psycopg
+import pytest
+from psycopg import sql
+from module_5.src.query_log import LoggedCursor, slow_query_logger
+from module_5.src.sql_utils import build_count_query, build_where_equals
+
+
+class FakeCursor:
+    """Cursor stand-in that records statements and returns a fixed row."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        """Record the statement."""
+        self.executed.append((query, params))
+        return self
+
+    def fetchone(self):
+        """Return a count row."""
+        return (42,)
+
+    def fetchall(self):
+        """Return a one-line plan."""
+        return [("Seq Scan on applicants  (actual rows=42)",)]
+
+
+class FakeConnection:
+    """Connection stand-in whose transaction() is a no-op savepoint."""
+
+    # Enough of an adapt context for sql.Composable.as_string().
+    adapters = psycopg.adapters
+    connection = None
+
+    def __init__(self):
+        self.explain_cursors = []
+
+    def transaction(self):
+        """No-op savepoint."""
+        return nullcontext()
+
+    def cursor(self):
+        """Hand out a fresh cursor for EXPLAIN."""
+        cur = FakeCursor(None)
+        self.explain_cursors.append(cur)
+        return cur
+
+
+@pytest.fixture
+def slow_log(caplog):
+    """A propagating logger captured by caplog."""
+    caplog.set_level(logging.INFO, logger="test.slow_queries")
+    return logging.getLogger("test.slow_queries")
+
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.mark.analysis
+def test_slow_select_is_logged_with_plan(slow_log, caplog):
+    """Over-threshold SELECTs log rendered SQL, params and the EXPLAIN plan."""
+    conn = FakeConnection()
+    where_clause, params = build_where_equals('degree', 'PhD')
+    query = build_count_query('applicants', where_clause, limit=10)
+
+    with LoggedCursor(FakeCursor(conn), threshold_ms=0, explain=True, logger=slow_log) as cur:
+        assert cur.execute(query, params).fetchone() == (42,)
+
+    message = caplog.records[-1].getMessage()
+    assert 'FROM "applicants"' in message
+    assert "params: ['PhD']" in message
+    assert "Seq Scan on applicants" in message
+    explain_sql, explain_params = conn.explain_cursors[0].executed[0]
+    assert explain_sql.as_string(None).startswith("EXPLAIN (ANALYZE, BUFFERS) SELECT")
+    assert explain_params == params
+
+
+@pytest.mark.analysis
+def test_fast_and_write_queries_are_not_explained(slow_log, caplog):
+    """Fast queries are not logged; writes are logged but never explained."""
+    conn = FakeConnection()
+
+    cur = LoggedCursor(FakeCursor(conn), threshold_ms=10_000, explain=True, logger=slow_log)
+    cur.execute(sql.SQL("SELECT 1"))
+    assert not caplog.records
+
+    cur = LoggedCursor(FakeCursor(conn), threshold_ms=0, explain=True, logger=slow_log)
+    cur.execute("DELETE FROM applicants WHERE p_id = %s", (1,))
+    assert "DELETE FROM applicants" in caplog.records[-1].getMessage()
+    assert "plan:" not in caplog.records[-1].getMessage()
+    assert not conn.explain_cursors
+
+
+@pytest.mark.analysis
+def test_default_logger_writes_rotating_file(tmp_path):
+    """The module logger writes to its file and does not propagate."""
+    logger = logging.getLogger("module_5.slow_queries")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    path = tmp_path / "slow.log"
+    try:
+        LoggedCursor(FakeCursor(None), threshold_ms=0, logger=slow_query_logger(str(path))).execute(
+            "SELECT 1"
+        )
+        for handler in logger.handlers:
+            handler.flush()
+        assert "slow query" in path.read_text(encoding="utf-8")
+        assert not logger.propagate
+    finally:
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
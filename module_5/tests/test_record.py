@@ -0,0 +1,79 @@
+"""Tests for ApplicantRecord and the record-building scraper cleanup."""
+
+import json
+import sys
+import pytest
+from bs4 import BeautifulSoup
+from module_5.src.clean import clean_data
+from module_5.src.record import APPLICANT_COLUMNS, ApplicantRecord
+from module_5.src.utils import create_record_from_json
+
+ROW_HTML = """
+<table>
+<tr>
+  <td><div class="tw-font-medium tw-text-gray-900 tw-text-sm">Johns Hopkins University</div></td>
+  <td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500">
+    <span>Computer Science</span><span>Masters</span>
+  </td>
+  <td class="tw-whitespace-nowrap">March 31, 2025</td>
+  <td><div class="tw-inline-flex tw-font-medium">Accepted on 1 Mar</div></td>
+  <td><a href="/result/12345">link</a></td>
+</tr>
+<tr class="tw-border-none">
+  <td>
+    <div class="tw-inline-flex">Fall 2025</div>
+    <div class="tw-inline-flex">International</div>
+    <div class="tw-inline-flex">GPA 3.90</div>
+    <div class="tw-inline-flex">GRE V 165</div>
+  </td>
+</tr>
+<tr class="tw-border-none">
+  <td><p class="tw-text-gray-500 tw-text-sm tw-my-0">Great   news!</p></td>
+</tr>
+</table>
+"""
+
+JSON_ROW = {
+    "program": "Computer Science, Johns Hopkins University",
+    "comments": "Great news!",
+    "date_added": "March 31, 2025",
+    "url": "https://www.thegradcafe.com/result/12345",
+    "status": "Accepted on 1 Mar",
+    "term": "Fall 2025",
+    "US/International": "International",
+    "GPA": "3.90",
+    "GRE V": "165",
+    "Degree": "Masters",
+}
+
+
+@pytest.mark.analysis
+def test_clean_data_builds_records():
+    """Scraped HTML becomes one record with every field filled in."""
+    records = clean_data(BeautifulSoup(ROW_HTML, "html.parser"))
+
+    assert records == [ApplicantRecord.from_dict(JSON_ROW)]
+    assert records[0].to_json_dict() == JSON_ROW
+
+
+@pytest.mark.analysis
+def test_json_round_trip_and_db_tuple():
+    """JSON keys map to columns, and unset fields are left out of JSON."""
+    record = ApplicantRecord.from_json(json.dumps(JSON_ROW))
+
+    assert record.us_or_international == "International"
+    assert record.gre_v == "165"
+    assert record.gre is None
+    assert dict(zip(APPLICANT_COLUMNS, record.to_db_tuple()))["degree"] == "Masters"
+    assert create_record_from_json(json.dumps(JSON_ROW)) == record.to_db_tuple()
+    assert "GRE" not in record.to_json_dict()
+    assert ApplicantRecord().to_json_dict() == {"url": None}
+
+
+@pytest.mark.analysis
+def test_record_is_smaller_than_dict():
+    """Slots keep a record smaller than the equivalent dict."""
+    record = ApplicantRecord.from_dict(JSON_ROW)
+
+    assert not hasattr(record, "__dict__")
+    assert sys.getsizeof(record) < sys.getsizeof(dict(JSON_ROW))
@@ -0,0 +1,70 @@
+"""Tests for the generator-based JSON/JSONL readers."""
+
+import json
+import pytest
+from module_5.src.line_index import LineIndex
+from module_5.src.update import prepend_llm_to_app
+from module_5.src.utils import (
+    iter_json_array, iter_json_objects, iter_jsonl, iter_records,
+)
+
+ROWS = [
+    {"url": f"u{i}", "program": "Maths ]," * (i % 7), "GPA": f"3.{i % 10}"}
+    for i in range(200)
+]
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize("chunk_size", [5, 64, 1 << 16])
+def test_iter_json_array_across_chunk_boundaries(tmp_path, chunk_size):
+    """Elements split across read chunks still decode in order."""
+    path = tmp_path / "rows.json"
+    path.write_text(json.dumps(ROWS, indent=4), encoding="utf-8")
+
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == ROWS
+
+
+@pytest.mark.analysis
+def test_iter_json_array_rejects_truncated_file(tmp_path):
+    """A file cut off mid-array raises once iteration reaches the end."""
+    path = tmp_path / "rows.json"
+    path.write_text(json.dumps(ROWS)[:-40], encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), chunk_size=256))
+
+
+@pytest.mark.analysis
+def test_iter_jsonl_filters_projects_and_skips_bad_lines(tmp_path):
+    """`where` and `fields` apply lazily; malformed lines are skipped."""
+    path = tmp_path / "rows.jsonl"
+    lines = [json.dumps(row) for row in ROWS[:5]] + ["", "{broken"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    rows = iter_jsonl(str(path), where=lambda r: r["url"] != "u1", fields=("url", "term"))
+
+    assert list(rows) == [{"url": u, "term": None} for u in ("u0", "u2", "u3", "u4")]
+    assert len(list(iter_records(str(path)))) == 5
+    with pytest.raises(FileNotFoundError):
+        iter_jsonl(str(tmp_path / "absent.jsonl"))
+
+
+@pytest.mark.analysis
+def test_prepend_llm_to_app_streams_into_place(tmp_path):
+    """LLM rows land in front of the app rows, and the index is rebuilt."""
+    llm_file = tmp_path / "llm.json"
+    app_file = tmp_path / "app.jsonl"
+    llm_file.write_text(
+        "\n".join(json.dumps(row, indent=2) for row in ROWS[:3]), encoding="utf-8"
+    )
+    app_file.write_text(
+        "\n".join(json.dumps(row) for row in ROWS[3:]) + "\n", encoding="utf-8"
+    )
+
+    prepend_llm_to_app(str(llm_file), str(app_file))
+
+    assert list(iter_json_objects(str(app_file))) == ROWS
+    assert not (tmp_path / "app.jsonl.tmp").exists()
+    with LineIndex.open(str(app_file)) as index:
+        assert len(index) == len(ROWS)
+        assert index.find_url("u150") == 150
@@ -0,0 +1,52 @@
+"""Tests for the pipeline tracing spans, counters and reports."""
+
+import json
+import time
+import pytest
+from module_5.src.tracing import Tracer
+
+
+@pytest.mark.analysis
+def test_spans_counters_and_report():
+    """Spans aggregate per name; timed_iter excludes the consumer's time."""
+    tracer = Tracer()
+
+    @tracer.traced("work.step")
+    def step(n):
+        return n * 2
+
+    with tracer.span("work.total", run=1):
+        assert [step(i) for i in range(3)] == [0, 2, 4]
+        for _ in tracer.timed_iter("work.produce", range(4)):
+            time.sleep(0.01)
+        tracer.count("work.rows", 4)
+
+    report = tracer.report()
+
+    assert report["spans"]["work.step"]["count"] == 3
+    assert report["spans"]["work.total"]["total_s"] >= 0.04
+    assert report["spans"]["work.produce"]["total_s"] < 0.01
+    assert report["counters"] == {"work.rows": 4}
+
+
+@pytest.mark.analysis
+def test_write_report_and_chrome_trace(tmp_path, monkeypatch):
+    """Both outputs are written when asked for, and nothing otherwise."""
+    tracer = Tracer()
+    with tracer.span("db.copy", rows=2):
+        pass
+
+    monkeypatch.delenv("TRACE_REPORT", raising=False)
+    monkeypatch.delenv("TRACE_CHROME", raising=False)
+    assert not tracer.write_report()
+
+    monkeypatch.setenv("TRACE_REPORT", str(tmp_path / "run-%Y.json"))
+    monkeypatch.setenv("TRACE_CHROME", str(tmp_path / "trace" / "chrome.json"))
+    written = tracer.write_report()
+
+    report_path = tmp_path / time.strftime("run-%Y.json")
+    assert written == [str(report_path), str(tmp_path / "trace" / "chrome.json")]
+    assert json.loads(report_path.read_text())["spans"]["db.copy"]["count"] == 1
+    event = json.loads((tmp_path / "trace" / "chrome.json").read_text())["traceEvents"][0]
+    assert (event["name"], event["ph"], event["cat"]) == ("db.copy", "X", "db")
+    assert event["args"] == {"rows": 2}